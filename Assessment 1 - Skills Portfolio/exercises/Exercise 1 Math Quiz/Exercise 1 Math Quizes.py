@@ -1,9 +1,14 @@
 import tkinter as tk
-from tkinter import messagebox
-import random
+import argparse
 import time
 import os
-from PIL import Image, ImageTk 
+from image_cache import ImageCache
+from sprites import SpriteSheet, blend_colours
+from screens import ScreenManager
+from quiz_engine import QuizEngine, QUESTIONS, CORRECT, RETRY
+from answers import format_answer
+from results_log import ResultLog
+from adaptive_scheduler import AdaptiveScheduler
 
 # --- PATH FINDER ---
 # This ensures Python finds your images no matter where you run this script
@@ -12,12 +17,55 @@ base_folder = os.path.dirname(os.path.abspath(__file__))
 HAPPY_IMG_PATH = os.path.join(base_folder, "Barney.jpg")
 SCARY_IMG_PATH = os.path.join(base_folder, "Angry Trex.jpg")
 RULER_IMG_PATH = os.path.join(base_folder, "Ruler.jpg")
+RESULTS_DB_PATH = os.path.join(base_folder, "quiz_results.db")
 
 # --- Configuration ---
 BARNEY_PURPLE = "#8E44AD"
 BARNEY_GREEN = "#2ECC71"
 ERROR_RED = "#7B0000"
 TEXT_COLOR = "#FFFFFF"
+WARNING_YELLOW = "#F1C40F"
+
+LEVEL_NAMES = {"easy": "Easy Peasy", "moderate": "Middle School", "advanced": "Big Brain"}
+
+# --- Feedback timing (ms) ---
+BANNER_HEIGHT = 44
+BANNER_STEPS = 8          # slide-in frames
+BANNER_FRAME_MS = 16      # ~60 fps
+BANNER_HOLD_MS = 1200
+ADVANCE_DELAY_MS = 800    # right answer -> next problem
+WRONG_DELAY_MS = 1600     # second wrong answer -> next problem (time to read the answer)
+RESET_DELAY_MS = 900      # how long the T-Rex stays after a first wrong answer
+MORPH_FRAMES = 12         # Barney -> T-Rex cross-fade, 0.2 s
+MORPH_FRAME_MS = 1000 / 60
+
+pending_jobs = {}  # name -> root.after id, see schedule()
+frame_hook = None  # if set, called with the seconds between morph frames (see benchmarks.py)
+
+# --- Startup ---
+ICON_SIZE = 64
+MASCOT_SIZE = (200, 240)  # menu and problem screens, Barney and the T-Rex the same size
+ASSET_POLL_MS = 20  # how often the menu checks whether its pictures are decoded yet
+
+# Every image size the screens use, decoded in the background at startup.
+# The icon and the menu picture come first, they are waited for.
+PRELOAD_SIZES = [
+    (RULER_IMG_PATH, ICON_SIZE, ICON_SIZE),  # window icon
+    (HAPPY_IMG_PATH, *MASCOT_SIZE),  # menu and problem
+    (SCARY_IMG_PATH, *MASCOT_SIZE),  # wrong answer
+    (HAPPY_IMG_PATH, 250, 300),  # results
+    (SCARY_IMG_PATH, 250, 300),
+]
+
+image_cache = ImageCache()
+# Blended once after the preload, played by morph()
+mascot_sprites = SpriteSheet(image_cache, HAPPY_IMG_PATH, SCARY_IMG_PATH, *MASCOT_SIZE, MORPH_FRAMES)
+MORPH_COLOURS = blend_colours(BARNEY_PURPLE, ERROR_RED, MORPH_FRAMES)
+
+# Problems, attempts and score live in the engine; this file only draws them.
+# The scheduler remembers how the player is doing across rounds and leans
+# the problems toward what they find hard.
+quiz = QuizEngine(scheduler=AdaptiveScheduler())
 
 # --- Helper Function for Images ---
 def load_and_resize_image(filepath, width, height):
@@ -25,209 +73,403 @@ def load_and_resize_image(filepath, width, height):
         if not os.path.exists(filepath):
             print(f"Warning: Could not find {filepath}")
             return None
-        img = Image.open(filepath)
-        img = img.resize((width, height), Image.Resampling.LANCZOS)
-        return ImageTk.PhotoImage(img)
+        # Decoded and resized once, then served from the cache
+        return image_cache.photo(filepath, width, height)
     except Exception as e:
         print(f"Error loading image: {e}")
         return None
 
 # --- Functions ---
 
-def displayMenu():
-    clear_window()
-    root.configure(bg=BARNEY_PURPLE)
-    
-    tk.Label(root, text="Barney's Edu-Tainment!", font=("Comic Sans MS", 24, "bold"), 
+def build_screens():
+    """Builds every screen once. After this, moving between screens only raises
+    frames and each question just reconfigures the existing widgets."""
+    global screens, problem_frame, question_label, image_label, problem_label, answer_entry
+    global menu_image_label, score_label, result_image_label, rank_label, feedback_banner
+    global board_title_label, board_stats_label, board_label
+
+    screens = ScreenManager(root)
+
+    # --- MENU ---
+    menu = screens.add("menu", bg=BARNEY_PURPLE)
+    tk.Label(menu, text="Barney's Edu-Tainment!", font=("Comic Sans MS", 24, "bold"), 
              bg=BARNEY_PURPLE, fg=BARNEY_GREEN).pack(pady=10)
     
-    # Happy Image
-    photo = load_and_resize_image(HAPPY_IMG_PATH, 200, 240)
-    if photo:
-        lbl = tk.Label(root, image=photo, bg=BARNEY_PURPLE)
-        lbl.image = photo 
-        lbl.pack(pady=5)
+    # Happy Image (a blank of the same size until load_assets() swaps Barney in)
+    menu_image_label = tk.Label(menu, bg=BARNEY_PURPLE)
+    set_mascot(menu_image_label, tk.PhotoImage(width=MASCOT_SIZE[0], height=MASCOT_SIZE[1]),
+               BARNEY_PURPLE)
+    menu_image_label.pack(pady=5)
 
-    tk.Label(root, text="Select Difficulty:", font=("Comic Sans MS", 14), 
+    tk.Label(menu, text="Select Difficulty:", font=("Comic Sans MS", 14), 
              bg=BARNEY_PURPLE, fg="white").pack(pady=5)
     
-    create_button("Easy Peasy", lambda: start_quiz("easy"))
-    create_button("Middle School", lambda: start_quiz("moderate"))
-    create_button("Big Brain", lambda: start_quiz("advanced"))
+    create_button(menu, "Easy Peasy", lambda: start_quiz("easy"))
+    create_button(menu, "Middle School", lambda: start_quiz("moderate"))
+    create_button(menu, "Big Brain", lambda: start_quiz("advanced"))
     
-    create_button("Exit", root.quit, bg_color="tomato")
+    create_button(menu, "Exit", root.quit, bg_color="tomato")
 
+    # Keys 1-3 pick a difficulty from the menu
+    for key, level in (("1", "easy"), ("2", "moderate"), ("3", "advanced")):
+        root.bind(key, lambda event, level=level: screens.current == "menu" and start_quiz(level))
 
-def create_button(text, command, bg_color=BARNEY_GREEN):
-    tk.Button(root, text=text, font=("Comic Sans MS", 12), width=20, 
-              bg=bg_color, fg="black", activebackground="yellow",
-              command=command).pack(pady=4)
+    # --- PROBLEM ---
+    problem_frame = screens.add("problem", bg=BARNEY_PURPLE)
+    question_label = tk.Label(problem_frame, font=("Comic Sans MS", 14, "bold"), 
+                              bg=BARNEY_PURPLE, fg="yellow")
+    question_label.pack(pady=5)
 
+    # --- BARNEY ---
+    image_label = tk.Label(problem_frame, bg=BARNEY_PURPLE)
+    image_label.pack(pady=2)
+    
+    # We display the math question
+    problem_label = tk.Label(problem_frame, font=("Comic Sans MS", 28, "bold"), 
+                             bg=BARNEY_PURPLE, fg=TEXT_COLOR)
+    problem_label.pack(pady=10)
 
-def randomInt(level):
-    if level == "easy": return random.randint(1, 9), random.randint(1, 9)
-    elif level == "moderate": return random.randint(10, 99), random.randint(10, 99)
-    elif level == "advanced": return random.randint(1000, 9999), random.randint(1000, 9999)
+    answer_entry = tk.Entry(problem_frame, font=("Comic Sans MS", 14), justify='center')
+    answer_entry.pack(pady=5)
 
+    # Enter submits, so a whole round can be played from the keyboard
+    answer_entry.bind("<Return>", check_answer)
+    answer_entry.bind("<KP_Enter>", check_answer)
 
-def decideOperation():
-    return random.choice(["+", "-", "*", "/"])
+    tk.Button(problem_frame, text="Submit Answer", command=check_answer, 
+              font=("Comic Sans MS", 12), bg=BARNEY_GREEN).pack(pady=10)
+    
+    tk.Button(problem_frame, text="Menu", command=displayMenu, bg="tomato").pack(pady=5)
 
+    # Placed over the top of the screen while a message is showing
+    feedback_banner = tk.Label(problem_frame, font=("Comic Sans MS", 13, "bold"))
 
-def displayProblem():
-    global current_question, num1, num2, operation, answer_entry, image_label
+    # --- RESULTS ---
+    results = screens.add("results", bg=BARNEY_PURPLE)
+    tk.Label(results, text="Quiz Complete!", font=("Comic Sans MS", 20, "bold"), 
+             bg=BARNEY_PURPLE, fg="yellow").pack(pady=10)
+    score_label = tk.Label(results, font=("Comic Sans MS", 16), bg=BARNEY_PURPLE, fg="white")
+    score_label.pack(pady=5)
 
-    clear_window()
-    root.configure(bg=BARNEY_PURPLE) 
+    result_image_label = tk.Label(results, bg=BARNEY_PURPLE)
+    result_image_label.pack(pady=10)
 
-    tk.Label(root, text=f"Problem {current_question}/10", font=("Comic Sans MS", 14, "bold"), 
-             bg=BARNEY_PURPLE, fg="yellow").pack(pady=5)
+    rank_label = tk.Label(results, font=("Comic Sans MS", 14, "italic"), 
+                          bg=BARNEY_PURPLE, fg="white")
+    rank_label.pack(pady=10)
     
-    num1, num2 = randomInt(difficulty)
-    operation = decideOperation()
+    create_button(results, "Play Again", displayMenu)
+    create_button(results, "Leaderboard", displayLeaderboard)
+    create_button(results, "Exit", root.quit, bg_color="tomato")
+
+    # --- LEADERBOARD ---
+    board = screens.add("leaderboard", bg=BARNEY_PURPLE)
+    tk.Label(board, text="Leaderboard", font=("Comic Sans MS", 24, "bold"), 
+             bg=BARNEY_PURPLE, fg=BARNEY_GREEN).pack(pady=10)
+    board_title_label = tk.Label(board, font=("Comic Sans MS", 14, "bold"), 
+                                 bg=BARNEY_PURPLE, fg="yellow")
+    board_title_label.pack(pady=5)
+    board_stats_label = tk.Label(board, font=("Comic Sans MS", 12), 
+                                 bg=BARNEY_PURPLE, fg="white")
+    board_stats_label.pack(pady=5)
+    board_label = tk.Label(board, font=("Courier New", 12), justify="left", 
+                           bg=BARNEY_PURPLE, fg="white")
+    board_label.pack(pady=10)
+    create_button(board, "Back", lambda: screens.show("results"))
+
+
+def set_mascot(label, photo, bg):
+    if photo:
+        label.configure(image=photo, bg=bg)
+        label.image = photo
+    else:
+        label.configure(bg=bg)
+
+
+def displayMenu():
+    cancel()
+    hide_banner()
+    screens.show("menu")
+    root.focus_set()  # the hidden answer box must not keep taking Enter
+
+
+def create_button(parent, text, command, bg_color=BARNEY_GREEN):
+    tk.Button(parent, text=text, font=("Comic Sans MS", 12), width=20, 
+              bg=bg_color, fg="black", activebackground="yellow",
+              command=command).pack(pady=4)
+
+
+def displayProblem():
+    cancel("reset", "advance", "morph")
+    problem = quiz.problem
+    quiz.mark_shown()  # time-to-answer starts now, not when the problem was made
 
-    if operation == "/":
-        num2 = random.randint(1, 9) if difficulty == "easy" else random.randint(2, 12)
-        num1 = num2 * random.randint(1, 9) if difficulty == "easy" else num2 * random.randint(2, 12)
+    problem_frame.configure(bg=BARNEY_PURPLE) 
+    question_label.configure(text=f"Problem {quiz.current_question}/{QUESTIONS}")
 
-    op_symbol = {"*": "×", "/": "÷"}.get(operation, operation)
+    op_symbol = {"*": "×", "/": "÷"}.get(problem.op, problem.op)
 
     # --- BARNEY ---
-    photo = load_and_resize_image(HAPPY_IMG_PATH, 180, 220)
-    image_label = tk.Label(root, image=photo, bg=BARNEY_PURPLE)
-    image_label.image = photo
-    image_label.pack(pady=2)
+    set_mascot(image_label, load_and_resize_image(HAPPY_IMG_PATH, *MASCOT_SIZE), BARNEY_PURPLE)
+    mascot_sprites.photos()  # sprite PhotoImages made here, not on the first wrong answer
     
     # We display the math question
-    tk.Label(root, text=f"{num1} {op_symbol} {num2} = ?", font=("Comic Sans MS", 28, "bold"), 
-             bg=BARNEY_PURPLE, fg=TEXT_COLOR).pack(pady=10)
+    problem_label.configure(text=f"{problem.a} {op_symbol} {problem.b} = ?")
 
-    answer_entry = tk.Entry(root, font=("Comic Sans MS", 14), justify='center')
-    answer_entry.pack(pady=5)
+    answer_entry.delete(0, tk.END)
+    screens.show("problem")
     answer_entry.focus()
 
-    tk.Button(root, text="Submit Answer", command=check_answer, 
-              font=("Comic Sans MS", 12), bg=BARNEY_GREEN).pack(pady=10)
-    
-    tk.Button(root, text="Menu", command=displayMenu, bg="tomato").pack(pady=5)
 
+def check_answer(event=None):
+    # The answer box sits on a stacked frame, so it can get Enter from other screens
+    if screens.current != "problem":
+        return
 
-def check_answer():
-    global score, current_question, attempt
+    # Enter while waiting for the next problem skips the wait
+    if "advance" in pending_jobs:
+        advance()
+        return
 
+    # Scores the answer exactly ("7", "3.5", "7/2" and "3 1/2" all work) and moves
+    # the quiz on (or not, for a first wrong answer)
     try:
-        user_answer = float(answer_entry.get())
+        result = quiz.submit(answer_entry.get())
     except ValueError:
-        messagebox.showwarning("Oops!", "Please enter a number!")
+        show_banner("Please enter a number!", WARNING_YELLOW, fg="black")
         return
 
-    if operation == "+": correct = num1 + num2
-    elif operation == "-": correct = num1 - num2
-    elif operation == "*": correct = num1 * num2
-    elif operation == "/": correct = num1 / num2
-
-    if abs(user_answer - correct) < 0.01:
-        # CORRECT
-        if attempt == 1: score += 10
-        else: score += 5
-        
-        messagebox.showinfo("Correct!", "Super! Points for you!")
-        current_question += 1
-        attempt = 1
-        
-        if current_question > 10: displayResults()
-        else: displayProblem()
+    if result.outcome == CORRECT:
+        show_banner("Super! Points for you!", BARNEY_GREEN, fg="black")
+        schedule("advance", ADVANCE_DELAY_MS, advance)
 
     else:
-        # WRONG: TRANSFORM!
-        root.configure(bg=ERROR_RED)
-        
-        # Change Barney to T-Rex
-        scary_photo = load_and_resize_image(SCARY_IMG_PATH, 220, 260)
-        if scary_photo:
-            image_label.configure(image=scary_photo, bg=ERROR_RED)
-            image_label.image = scary_photo
-
-        root.update()
-        
-        if attempt == 1:
-            attempt += 1
-            # "Slap" warning
-            messagebox.showwarning("WRONG", "I hear a growl on the distance...\nTry again.")
-            
-            # Reset visuals
-            root.configure(bg=BARNEY_PURPLE)
-            happy_photo = load_and_resize_image(HAPPY_IMG_PATH, 180, 220)
-            image_label.configure(image=happy_photo, bg=BARNEY_PURPLE)
-            image_label.image = happy_photo
+        # WRONG: TRANSFORM! Barney fades into the T-Rex
+        morph(to_trex=True)
+
+        if result.outcome == RETRY:
+            # "Slap" warning, then Barney comes back while they try again
+            show_banner("I hear a growl on the distance... Try again.", "tomato")
+            answer_entry.delete(0, tk.END)
+            schedule("reset", RESET_DELAY_MS, reset_mascot)
+        else:
+            show_banner(f"ROARS!!!! Answer: {format_answer(result.answer)}", "tomato", hold_ms=WRONG_DELAY_MS)
+            schedule("advance", WRONG_DELAY_MS, advance)
+
+
+def reset_mascot():
+    # Reset visuals
+    morph(to_trex=False)
+
+
+def morph(to_trex):
+    """Cross-fades Barney into the T-Rex (or back) with the precomputed sprites,
+    one frame every MORPH_FRAME_MS. Until the sprites are made it swaps at once."""
+    frames = mascot_sprites.photos()
+    if not frames:
+        path, bg = (SCARY_IMG_PATH, ERROR_RED) if to_trex else (HAPPY_IMG_PATH, BARNEY_PURPLE)
+        problem_frame.configure(bg=bg)
+        set_mascot(image_label, load_and_resize_image(path, *MASCOT_SIZE), bg)
+        return
+
+    order = range(MORPH_FRAMES) if to_trex else range(MORPH_FRAMES - 1, -1, -1)
+    start = previous = time.perf_counter()
+
+    def draw(step):
+        nonlocal previous
+        now = time.perf_counter()
+        if frame_hook and step:
+            frame_hook(now - previous)
+        previous = now
+
+        index = order[step]
+        problem_frame.configure(bg=MORPH_COLOURS[index])
+        set_mascot(image_label, frames[index], MORPH_COLOURS[index])
+        if step + 1 < MORPH_FRAMES:
+            # Frames are due at fixed times from the start, so one late frame
+            # does not push all the others back
+            due = start + (step + 1) * MORPH_FRAME_MS / 1000
+            delay = max(0, round((due - time.perf_counter()) * 1000))
+            schedule("morph", delay, lambda: draw(step + 1))
+
+    draw(0)
+
+
+def advance():
+    cancel("advance")
+    if quiz.finished: displayResults()
+    else: displayProblem()
+
+
+# --- Feedback without modal dialogs ---
+# Messages slide in over the top of the screen and the quiz moves on by itself,
+# all through root.after, so the event loop never stops waiting for an OK click.
+
+def schedule(name, delay_ms, func):
+    """Runs func after delay_ms, replacing any job already scheduled under name."""
+    cancel(name)
+
+    def run():
+        pending_jobs.pop(name, None)
+        func()
+
+    pending_jobs[name] = root.after(delay_ms, run)
+
+
+def cancel(*names):
+    for name in names or list(pending_jobs):
+        job = pending_jobs.pop(name, None)
+        if job:
+            root.after_cancel(job)
+
+
+def show_banner(text, bg, fg="white", hold_ms=BANNER_HOLD_MS):
+    feedback_banner.configure(text=text, bg=bg, fg=fg)
+
+    def slide(step):
+        y = BANNER_HEIGHT * step // BANNER_STEPS - BANNER_HEIGHT
+        feedback_banner.place(x=0, y=y, relwidth=1, height=BANNER_HEIGHT)
+        feedback_banner.lift()
+        if step < BANNER_STEPS:
+            schedule("banner", BANNER_FRAME_MS, lambda: slide(step + 1))
         else:
-            messagebox.showerror("FAIL", f"ROARS!!!!\nAnswer: {correct:.2f}")
-            current_question += 1
-            attempt = 1
-            if current_question > 10: displayResults()
-            else: displayProblem()
+            schedule("banner", hold_ms, hide_banner)
+
+    slide(1)
+
+
+def hide_banner():
+    cancel("banner")
+    feedback_banner.place_forget()
 
 
 def displayResults():
-    clear_window()
-    root.configure(bg=BARNEY_PURPLE)
-    
-    tk.Label(root, text="Quiz Complete!", font=("Comic Sans MS", 20, "bold"), 
-             bg=BARNEY_PURPLE, fg="yellow").pack(pady=10)
-    tk.Label(root, text=f"Final Score: {score} / 100", font=("Comic Sans MS", 16), 
-             bg=BARNEY_PURPLE, fg="white").pack(pady=5)
+    cancel()
+    hide_banner()
+    score_label.configure(text=f"Final Score: {quiz.score} / 100")
 
-    if score >= 60:
+    if quiz.score >= 60:
         final_img_path = HAPPY_IMG_PATH
         rank = "You survived! Great job!"
     else:
         final_img_path = SCARY_IMG_PATH
         rank = "Run."
 
-    photo = load_and_resize_image(final_img_path, 250, 300)
-    if photo:
-        lbl = tk.Label(root, image=photo, bg=BARNEY_PURPLE)
-        lbl.image = photo
-        lbl.pack(pady=10)
+    set_mascot(result_image_label, load_and_resize_image(final_img_path, 250, 300), BARNEY_PURPLE)
+    rank_label.configure(text=rank)
+    screens.show("results")
+    root.focus_set()
 
-    tk.Label(root, text=rank, font=("Comic Sans MS", 14, "italic"), 
-             bg=BARNEY_PURPLE, fg="white").pack(pady=10)
-    
-    create_button("Play Again", displayMenu)
-    create_button("Exit", root.quit, bg_color="tomato")
+    # Saved by a background thread, this only queues it
+    results_log.record(quiz)
+
+
+def displayLeaderboard():
+    """Top 10 and running statistics for the difficulty just played (indexed queries)."""
+    level = quiz.difficulty
+    board_title_label.configure(text=LEVEL_NAMES[level])
+    try:
+        sessions, average, best, seconds = results_log.stats(level)
+        top = results_log.leaderboard(level)
+        played = sum(question.seconds for question in quiz.history)
+        position = results_log.rank(level, quiz.score, played)
+    except Exception as e:
+        print(f"Could not read results: {e}")
+        board_stats_label.configure(text="Results are not available.")
+        board_label.configure(text="")
+        screens.show("leaderboard")
+        return
+
+    board_stats_label.configure(text=(
+        f"Quizzes played: {sessions:,}   Best: {best}\n"
+        f"Average score: {average:.1f}   Average time: {seconds:.0f}s\n"
+        f"Your score of {quiz.score} ranks #{position:,}"))
+    lines = [f"{number:>2}. {score:>3} pts {time_taken:6.1f}s  "
+             f"{time.strftime('%d %b %Y', time.localtime(finished_at))}"
+             for number, (score, time_taken, finished_at) in enumerate(top, start=1)]
+    board_label.configure(text="\n".join(lines) or "No results yet.")
+    screens.show("leaderboard")
 
 
 def start_quiz(level):
-    global difficulty, current_question, score, attempt
-    difficulty = level
-    score = 0
-    current_question = 1
-    attempt = 1
+    quiz.start(level)
     displayProblem()
 
 
-def clear_window():
-    for widget in root.winfo_children():
-        widget.destroy()
+# --- Main Window ---
+def build_window(fast_start=True):
+    """Builds the window and every screen. With fast_start the pictures (and PIL)
+    are left to a background thread and the menu first shows with text only;
+    otherwise they are decoded here, before the window appears."""
+    global root, results_log, assets_loaded
+    root = tk.Tk()
+    root.title("Barney's Math Adventure")
+    root.geometry("500x650")
+    root.configure(bg=BARNEY_PURPLE)
+    root.resizable(False, False)
+
+    results_log = ResultLog(RESULTS_DB_PATH)
+    build_screens()
 
+    assets_loaded = False
+    image_cache.preload(PRELOAD_SIZES, then=mascot_sprites.make)
+    if fast_start:
+        root.after(ASSET_POLL_MS, load_assets)
+    else:
+        image_cache.preloader.join()
+        load_assets()
+    return root
+
+
+def load_assets():
+    """Sets the window icon and the menu picture once the preload thread has
+    decoded them, checking back every ASSET_POLL_MS until then."""
+    global assets_loaded
+    waiting = [size for size in PRELOAD_SIZES[:2] if not image_cache.ready(*size)]
+    if waiting and image_cache.preloader.is_alive():
+        root.after(ASSET_POLL_MS, load_assets)
+        return
 
-# --- Main Window ---
-root = tk.Tk()
-root.title("Barney's Math Adventure")
-root.geometry("500x650")
-root.configure(bg=BARNEY_PURPLE)
-root.resizable(False, False)
-
-# --- SETTING THE CUSTOM ICON (Replacing the Feather) ---
-try:
-    # 1. Load the Ruler image using Pillow
-    icon_image = Image.open(RULER_IMG_PATH)
-    # 2. Convert it to a format Tkinter understands
-    photo_icon = ImageTk.PhotoImage(icon_image)
-    # 3. Set it as the window icon
-    root.iconphoto(False, photo_icon)
-except Exception as e:
-    print(f"Could not set icon: {e}")
-
-displayMenu()
-root.mainloop()
+    # --- SETTING THE CUSTOM ICON (Replacing the Feather) ---
+    # Scaled down to icon size, rather than the full 2000x2000 picture
+    icon = load_and_resize_image(RULER_IMG_PATH, ICON_SIZE, ICON_SIZE)
+    if icon:
+        root.iconphoto(False, icon)
+    set_mascot(menu_image_label, load_and_resize_image(HAPPY_IMG_PATH, *MASCOT_SIZE), BARNEY_PURPLE)
+    assets_loaded = True
+
+
+def startup_probe():
+    """Prints when the window is first mapped and when its pictures are in, then
+    quits. Used by benchmarks.bench_startup to time startup from outside."""
+    def mapped(event):
+        if event.widget is root:
+            root.unbind("<Map>")
+            print(f"mapped {time.time()}", flush=True)
+            wait_for_assets()
+
+    def wait_for_assets():
+        if not assets_loaded:
+            root.after(5, wait_for_assets)
+            return
+        print(f"assets {time.time()}", flush=True)
+        root.quit()
+
+    root.bind("<Map>", mapped)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Barney's Math Adventure")
+    parser.add_argument("--slow-start", action="store_true",
+                        help="decode the pictures before showing the window")
+    parser.add_argument("--startup-probe", action="store_true",
+                        help="print startup times and quit (see benchmarks.py)")
+    args = parser.parse_args()
+
+    build_window(fast_start=not args.slow_start)
+    displayMenu()
+    if args.startup_probe:
+        startup_probe()
+    root.mainloop()
+    results_log.close()  # writes anything still queued
+    print(f"Image cache: {image_cache.report()}")
\ No newline at end of file
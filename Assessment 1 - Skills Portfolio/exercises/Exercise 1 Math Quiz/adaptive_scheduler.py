@@ -0,0 +1,104 @@
+import random
+from itertools import accumulate
+
+from quiz_engine import OPERATIONS, LEVEL_RANGES, DIVISION_RANGES, Problem, calculate
+
+BANDS = 3  # each level's operand range is split into small / medium / large numbers
+
+
+class RollingStat:
+    """Exponentially weighted accuracy and answer time. O(1) memory and update,
+    and recent answers count more than old ones."""
+    __slots__ = ("accuracy", "seconds", "count")
+
+    def __init__(self, accuracy=0.75):
+        self.accuracy = accuracy  # prior: assume mostly right until we know better
+        self.seconds = None
+        self.count = 0
+
+    def update(self, correct, seconds, alpha):
+        self.count += 1
+        self.accuracy += alpha * (correct - self.accuracy)
+        if self.seconds is None:
+            self.seconds = seconds
+        else:
+            self.seconds += alpha * (seconds - self.seconds)
+
+
+def band_range(low, high, band):
+    """The part of low..high that belongs to a band."""
+    width = high - low + 1
+    start = low + width * band // BANDS
+    end = low + width * (band + 1) // BANDS - 1
+    return start, max(start, end)
+
+
+class AdaptiveScheduler:
+    """Picks the next problem toward the player's weak spots.
+
+    Keeps a RollingStat per operation and per (operation, band). An operation or
+    band is picked more often the lower its accuracy and the slower its answers,
+    with a floor (explore) so nothing disappears completely. Weights are only
+    recomputed after an answer, so picking a problem is two weighted choices.
+    """
+
+    def __init__(self, alpha=0.2, explore=0.25, slow_weight=0.5):
+        self.alpha = alpha
+        self.explore = explore
+        self.slow_weight = slow_weight
+        self.op_stats = {op: RollingStat() for op in OPERATIONS}
+        self.band_stats = {(op, band): RollingStat() for op in OPERATIONS for band in range(BANDS)}
+        self.last = None  # (op, band) of the problem waiting for an answer
+        self.refresh_weights()
+
+    def weakness(self, stat, mean_seconds):
+        weight = self.explore + (1 - stat.accuracy)
+        if stat.seconds is not None and mean_seconds:
+            slowness = min(1.0, max(0.0, stat.seconds / mean_seconds - 1))
+            weight += self.slow_weight * slowness
+        return weight
+
+    def refresh_weights(self):
+        timed = [stat.seconds for stat in self.op_stats.values() if stat.seconds is not None]
+        mean_seconds = sum(timed) / len(timed) if timed else None
+        self.op_weights = list(accumulate(
+            self.weakness(self.op_stats[op], mean_seconds) for op in OPERATIONS))
+        self.band_weights = {
+            op: list(accumulate(self.weakness(self.band_stats[op, band], mean_seconds)
+                                for band in range(BANDS)))
+            for op in OPERATIONS}
+
+    def next_problem(self, level, rng=random):
+        op = rng.choices(OPERATIONS, cum_weights=self.op_weights)[0]
+        band = rng.choices(range(BANDS), cum_weights=self.band_weights[op])[0]
+        if op == "/":
+            # Same exact-division rule as make_problem, the band sets the quotient
+            low, high = DIVISION_RANGES[level]
+            b = rng.randint(low, high)
+            a = b * rng.randint(*band_range(low, high, band))
+        else:
+            low, high = band_range(*LEVEL_RANGES[level], band)
+            a, b = rng.randint(low, high), rng.randint(low, high)
+        self.last = (op, band)
+        return Problem(a, op, b, calculate(a, op, b))
+
+    def record(self, correct, seconds):
+        """How the last problem went (correct = right first time)."""
+        if self.last is None:
+            return
+        op, band = self.last
+        self.op_stats[op].update(correct, seconds, self.alpha)
+        self.band_stats[op, band].update(correct, seconds, self.alpha)
+        self.last = None
+        self.refresh_weights()
+
+    def report(self):
+        """{op: (accuracy, seconds, share of picks)}, for showing or debugging."""
+        total = self.op_weights[-1]
+        previous = 0
+        report = {}
+        for op, weight in zip(OPERATIONS, self.op_weights):
+            stat = self.op_stats[op]
+            report[op] = (stat.accuracy, stat.seconds, (weight - previous) / total)
+            previous = weight
+        return report
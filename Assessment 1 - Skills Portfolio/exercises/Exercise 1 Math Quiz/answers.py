@@ -0,0 +1,57 @@
+import re
+from fractions import Fraction
+
+# Longer text is not an answer anyone typed; refusing it keeps parsing cheap
+MAX_ANSWER_LENGTH = 40
+
+# Everything a player might type for a number: 7, -7, 3.5, .5, 7/2, 3 1/2, -3 1/2
+ANSWER_PATTERN = re.compile(r"""
+    \s*(?P<sign>[-+−]?)\s*
+    (?:
+        (?:(?P<whole>\d+)\s+)?(?P<num>\d+)\s*/\s*(?P<den>\d+)   # fraction, maybe mixed
+      | (?P<int>\d*)(?:\.(?P<dec>\d*))?                       # integer or decimal
+    )
+    \s*\Z""", re.VERBOSE)
+
+
+def parse_answer(text):
+    """The exact value of a typed answer: an int when it is whole, otherwise a Fraction.
+    Raises ValueError (like float()) when the text is not a number or is too long."""
+    if len(text) > MAX_ANSWER_LENGTH:
+        raise ValueError(f"answer too long ({len(text)} characters)")
+    match = ANSWER_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f"not a number: {text!r}")
+    sign, whole, num, den, digits, dec = match.groups()
+
+    if num is not None:
+        den = int(den)
+        if den == 0:
+            raise ValueError(f"division by zero: {text!r}")
+        value = Fraction(int(num), den)
+        if whole is not None:
+            value += int(whole)
+    else:
+        if not digits and not dec:
+            raise ValueError(f"not a number: {text!r}")
+        if dec is None:
+            value = int(digits)  # the usual case, no Fraction needed
+        else:
+            dec = dec.rstrip("0")
+            value = Fraction(int((digits or "0") + dec), 10 ** len(dec))
+
+    if isinstance(value, Fraction) and value.denominator == 1:
+        value = value.numerator
+    return -value if sign and sign != "+" else value
+
+
+def format_answer(value):
+    """A whole number as-is, anything else as a (mixed) fraction: 7, -2, 3 1/2, 2/3."""
+    value = Fraction(value)
+    if value.denominator == 1:
+        return str(value.numerator)
+    whole, rest = divmod(abs(value.numerator), value.denominator)
+    sign = "-" if value < 0 else ""
+    if whole == 0:
+        return f"{sign}{rest}/{value.denominator}"
+    return f"{sign}{whole} {rest}/{value.denominator}"
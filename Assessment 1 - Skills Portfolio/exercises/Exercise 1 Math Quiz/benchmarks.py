@@ -0,0 +1,416 @@
+"""Performance checks for Barney's Math Adventure.
+
+Run from this folder:  python benchmarks.py
+The screen benchmarks need a display (they build a real Tk window).
+"""
+import importlib.util
+import os
+import statistics
+import tempfile
+import time
+import tkinter as tk
+import tracemalloc
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+QUIZ_PATH = os.path.join(BASE_DIR, "Exercise 1 Math Quizes.py")
+
+def load_quiz_module():
+    """Imports the quiz script (its file name has spaces, so no plain import)."""
+    spec = importlib.util.spec_from_file_location("math_quiz", QUIZ_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.RESULTS_DB_PATH = os.path.join(tempfile.mkdtemp(), "quiz_results.db")
+    return module
+
+
+def current_answer(module):
+    return module.quiz.problem.answer
+
+
+def count_tk_objects(root):
+    """(widgets, Tcl commands, images) currently alive in the interpreter."""
+    widgets, stack = 0, [root]
+    while stack:
+        children = stack.pop().winfo_children()
+        widgets += len(children)
+        stack.extend(children)
+    return widgets, len(root.tk.call("info", "commands")), len(root.image_names())
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def timed_ms(func, repeat=20):
+    """Best-of-N wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def legacy_problem_screen(quiz, parent):
+    """The old displayProblem: destroy every widget, then build the screen again."""
+    for widget in parent.winfo_children():
+        widget.destroy()
+    tk.Label(parent, text="Problem 1/10", font=("Comic Sans MS", 14, "bold"),
+             bg=quiz.BARNEY_PURPLE, fg="yellow").pack(pady=5)
+    photo = quiz.load_and_resize_image(quiz.HAPPY_IMG_PATH, 180, 220)
+    label = tk.Label(parent, image=photo, bg=quiz.BARNEY_PURPLE)
+    label.image = photo
+    label.pack(pady=2)
+    tk.Label(parent, text="12 + 34 = ?", font=("Comic Sans MS", 28, "bold"),
+             bg=quiz.BARNEY_PURPLE, fg=quiz.TEXT_COLOR).pack(pady=10)
+    tk.Entry(parent, font=("Comic Sans MS", 14), justify='center').pack(pady=5)
+    tk.Button(parent, text="Submit Answer", font=("Comic Sans MS", 12), bg=quiz.BARNEY_GREEN).pack(pady=10)
+    tk.Button(parent, text="Menu", bg="tomato").pack(pady=5)
+
+
+def bench_transitions(rounds=100):
+    """Screen transitions over a long session: persistent screens vs destroy/rebuild."""
+    quiz = load_quiz_module()
+    root = quiz.build_window()
+    quiz.displayMenu()
+    root.update()
+
+    def timed_step(step):
+        start = time.perf_counter()
+        step()
+        root.update_idletasks()
+        return (time.perf_counter() - start) * 1000
+
+    def answer():
+        quiz.answer_entry.delete(0, tk.END)
+        quiz.answer_entry.insert(0, str(current_answer(quiz)))
+        quiz.check_answer()
+        quiz.advance()  # don't wait for the auto-advance timer
+
+    before = count_tk_objects(root)
+    tracemalloc.start()
+    times = []
+    for _ in range(rounds):
+        times.append(timed_step(lambda: quiz.start_quiz("moderate")))
+        for _ in range(10):
+            times.append(timed_step(answer))
+        times.append(timed_step(quiz.displayMenu))
+    growth = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    after = count_tk_objects(root)
+
+    print(f"{rounds} quiz rounds ({len(times):,} transitions)")
+    print(f"  persistent screens | median {statistics.median(times):6.2f} ms"
+          f" | p95 {percentile(times, 0.95):6.2f} ms | python memory +{growth / 1024:.0f} KiB")
+    print(f"    widgets/commands/images before {before}, after {after}")
+
+    container = tk.Toplevel(root)
+    before = count_tk_objects(root)
+    tracemalloc.start()
+    legacy = [timed_step(lambda: legacy_problem_screen(quiz, container)) for _ in range(len(times))]
+    growth = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    after = count_tk_objects(root)
+    print(f"  destroy + rebuild  | median {statistics.median(legacy):6.2f} ms"
+          f" | p95 {percentile(legacy, 0.95):6.2f} ms | python memory +{growth / 1024:.0f} KiB")
+    print(f"    widgets/commands/images before {before}, after {after}")
+
+    root.destroy()
+
+
+def bench_keyboard_round(rounds=5):
+    """Plays whole rounds by typing answers and pressing Enter (no mouse, no dialogs).
+
+    submit -> feedback:  Enter pressed until the banner is on screen
+    submit -> next:      until the next problem is shown, with the auto-advance delay
+    skip -> next:        a second Enter skips the delay
+    """
+    quiz = load_quiz_module()
+    root = quiz.build_window()
+    quiz.displayMenu()
+    root.update()
+
+    def press(widget, key):
+        widget.focus_force()
+        root.update()
+        start = time.perf_counter()
+        widget.event_generate(key)
+        return start
+
+    def wait_until(condition):
+        while not condition():
+            root.update()
+            time.sleep(0.0005)
+        return time.perf_counter()
+
+    feedback, to_next, skipped = [], [], []
+    for round_number in range(rounds):
+        press(root, "1")
+        wait_until(lambda: quiz.screens.current == "problem")
+        for question in range(10):
+            entry = quiz.answer_entry
+            entry.delete(0, tk.END)
+            entry.insert(0, str(current_answer(quiz)))
+            shown = quiz.question_label.cget("text")
+            start = press(entry, "<Return>")
+            feedback.append(wait_until(quiz.feedback_banner.winfo_ismapped) - start)
+            if round_number % 2:
+                start = press(entry, "<Return>")
+                times = skipped
+            else:
+                times = to_next
+            times.append(wait_until(lambda: quiz.question_label.cget("text") != shown
+                                    or quiz.screens.current == "results") - start)
+        quiz.displayMenu()
+
+    print(f"keyboard rounds ({rounds} x 10 questions, auto-advance after {quiz.ADVANCE_DELAY_MS} ms)")
+    for label, times in [("submit -> feedback", feedback), ("submit -> next", to_next),
+                         ("skip -> next", skipped)]:
+        if times:
+            times = [t * 1000 for t in times]
+            print(f"  {label:<18} | median {statistics.median(times):7.2f} ms"
+                  f" | p95 {percentile(times, 0.95):7.2f} ms")
+
+    root.destroy()
+
+
+def bench_server(sessions=5_000):
+    """Quiz server throughput: sessions/sec and p99 answer latency (no display needed)."""
+    import asyncio
+    from quiz_loadtest import run_load_test
+
+    asyncio.run(run_load_test(sessions=sessions, seed=1))
+
+
+def bench_results_log(sessions=200_000):
+    """Writing finished quizzes through the background writer, then querying them."""
+    import random
+    from quiz_engine import QuizEngine
+    from results_log import ResultLog
+
+    rng = random.Random(1)
+    levels = ["easy", "moderate", "advanced"]
+    with tempfile.TemporaryDirectory() as folder:
+        log = ResultLog(os.path.join(folder, "quiz_results.db"))
+        quiz = QuizEngine(rng)
+
+        start = time.perf_counter()
+        worst_record = 0
+        for _ in range(sessions):
+            quiz.start(rng.choice(levels))
+            while not quiz.finished:
+                answer = quiz.problem.answer + (rng.random() < 0.3)
+                quiz.submit(answer)
+            before = time.perf_counter()
+            log.record(quiz)
+            worst_record = max(worst_record, time.perf_counter() - before)
+        queued = time.perf_counter() - start
+        log.flush()
+        written = time.perf_counter() - start
+
+        board_ms = timed_ms(lambda: log.leaderboard("moderate"))
+        stats_ms = timed_ms(lambda: log.stats("moderate"))
+        rank_ms = timed_ms(lambda: log.rank("moderate", 50, 30.0))
+        log.close()
+
+        size = os.path.getsize(os.path.join(folder, "quiz_results.db"))
+        print(f"result log with {sessions:,} sessions ({size / 2**20:.1f} MiB)")
+        print(f"  played + queued: {queued:6.1f} s | on disk after: {written:6.1f} s"
+              f" | slowest record() call: {worst_record * 1000:.2f} ms")
+        print(f"  top 10: {board_ms:.2f} ms | stats: {stats_ms:.2f} ms | rank: {rank_ms:.2f} ms")
+
+
+def bench_adaptive(players=500, rounds=300):
+    """Synthetic players with a few weak (operation, band) spots, taught with uniform
+    problems and with the AdaptiveScheduler. Each problem practised lifts that spot's
+    skill a little, so the better scheduler leaves the weak spots stronger."""
+    import random
+    from adaptive_scheduler import AdaptiveScheduler, BANDS
+    from quiz_engine import OPERATIONS
+
+    spots = [(op, band) for op in OPERATIONS for band in range(BANDS)]
+
+    def make_player(rng):
+        skill = {spot: rng.uniform(0.8, 0.95) for spot in spots}
+        weak = rng.sample(spots, 3)
+        for spot in weak:
+            skill[spot] = rng.uniform(0.2, 0.45)
+        return skill, weak
+
+    def practise(skill, spot, rng):
+        correct = rng.random() < skill[spot]
+        skill[spot] += 0.02 * (0.98 - skill[spot])
+        return correct, rng.uniform(2, 4) / skill[spot]
+
+    results = {}
+    pick_times = []
+    for name in ["uniform", "adaptive"]:
+        rng = random.Random(7)
+        weak_picks = 0
+        weak_skill = []
+        for _ in range(players):
+            skill, weak = make_player(rng)
+            scheduler = AdaptiveScheduler()
+            for _ in range(rounds):
+                if name == "uniform":
+                    spot = (rng.choice(OPERATIONS), rng.randrange(BANDS))
+                else:
+                    start = time.perf_counter()
+                    scheduler.next_problem("moderate", rng)
+                    pick_times.append(time.perf_counter() - start)
+                    spot = scheduler.last
+                correct, seconds = practise(skill, spot, rng)
+                if name == "adaptive":
+                    scheduler.record(correct, seconds)
+                weak_picks += spot in weak
+            weak_skill.extend(skill[spot] for spot in weak)
+        results[name] = (weak_picks / (players * rounds), statistics.mean(weak_skill))
+
+    scheduler.last = ("+", 0)
+    start = time.perf_counter()
+    scheduler.record(True, 3.0)
+    record_us = (time.perf_counter() - start) * 1e6
+    pick_us = [t * 1e6 for t in pick_times]
+    print(f"adaptive scheduler: {players} synthetic players x {rounds:,} problems "
+          f"({len(spots) - 3} strong, 3 weak spots each)")
+    for name, (share, skill) in results.items():
+        print(f"  {name:<9} weak-spot share: {share:5.1%} | weak-spot skill at the end: {skill:.2f}")
+    print(f"  next_problem: p50 {statistics.median(pick_us):.1f} us | p99 {percentile(pick_us, 0.99):.1f} us"
+          f" | record: {record_us:.1f} us")
+
+
+def bench_answer_check(pairs=1_000_000):
+    """Property check and timing for exact answer checking.
+
+    Every generated problem's answer is typed several ways (7, 7.0, 14/2, " 7 ")
+    and must parse to exactly the answer, while off-by-one and off-by-a-thousandth
+    answers must be rejected. Random fractions must survive format_answer -> parse_answer
+    in mixed and decimal form.
+    """
+    import random
+    from decimal import Decimal
+    from fractions import Fraction
+    from answers import MAX_ANSWER_LENGTH, parse_answer, format_answer
+    from quiz_engine import Problem, generate_batch, is_correct
+
+    failures = []
+
+    def expect(ok, what):
+        if not ok:
+            failures.append(what)
+
+    start = time.perf_counter()
+    checked = 0
+    for level in ["easy", "moderate", "advanced"]:
+        batch = generate_batch(level, pairs // 3, seed=3, use_numpy=False)
+        for problem in batch:
+            answer = problem.answer
+            for text in (str(answer), f"{answer}.0", f"{answer * 2}/2", f" {answer} "):
+                expect(is_correct(problem, parse_answer(text)), (problem, text))
+            expect(not is_correct(problem, parse_answer(str(answer + 1))), (problem, "+1"))
+            expect(not is_correct(problem, parse_answer(f"{answer}.001")), (problem, ".001"))
+            checked += 6
+    problems_s = time.perf_counter() - start
+
+    rng = random.Random(3)
+    start = time.perf_counter()
+    fractions = 0
+    for _ in range(pairs // 10):
+        value = Fraction(rng.randint(-10_000, 10_000), rng.choice([1, 2, 3, 4, 5, 7, 8, 10, 12, 100]))
+        expect(parse_answer(format_answer(value)) == value, (value, format_answer(value)))
+        if 10**6 % value.denominator == 0:
+            decimal = format(Decimal(value.numerator) / Decimal(value.denominator), "f")
+            expect(parse_answer(decimal) == value, (value, decimal))
+            fractions += 1
+        fractions += 1
+    fractions_s = time.perf_counter() - start
+
+    for text in ["1e10000000", "1e3", "7" * (MAX_ANSWER_LENGTH + 1), "3 1/2/2", ""]:
+        try:
+            parse_answer(text)
+            expect(False, (text[:20], "accepted"))
+        except ValueError:
+            pass
+
+    texts = [str(rng.randint(-99, 9801)) for _ in range(100_000)]
+    start = time.perf_counter()
+    for text in texts:
+        parse_answer(text)
+    parse_us = (time.perf_counter() - start) / len(texts) * 1e6
+    problem = Problem(7, "/", 2, Fraction(7, 2))
+    check_us = timed_ms(lambda: is_correct(problem, parse_answer("3 1/2")), repeat=1000) * 1000
+
+    print(f"exact answer checking: {checked:,} problem/answer pairs in {problems_s:.1f} s "
+          f"({checked / problems_s:,.0f}/s), {fractions:,} fraction round trips in {fractions_s:.1f} s")
+    print(f"  parse whole number: {parse_us:.2f} us | parse + check \"3 1/2\": {check_us:.2f} us")
+    print(f"  failures: {len(failures)}" + "".join(f"\n    {failure}" for failure in failures[:10]))
+
+
+def bench_startup(runs=5):
+    """Process start to first mapped window, and to the pictures being in, for the
+    default fast start and for --slow-start. Needs a display."""
+    import subprocess
+    import sys
+
+    for label, flags in [("fast start", []), ("slow start", ["--slow-start"])]:
+        mapped, assets = [], []
+        for _ in range(runs):
+            start = time.time()
+            try:
+                output = subprocess.run([sys.executable, QUIZ_PATH, "--startup-probe", *flags],
+                                        capture_output=True, text=True, timeout=60)
+            except subprocess.TimeoutExpired:
+                print("startup: the quiz did not quit, is the window being shown?")
+                return
+            times = dict(line.split() for line in output.stdout.splitlines()
+                         if line.startswith(("mapped ", "assets ")))
+            if "mapped" not in times:
+                print(f"startup: could not open the window ({output.stderr.strip().splitlines()[-1:]})")
+                return
+            mapped.append((float(times["mapped"]) - start) * 1000)
+            assets.append((float(times["assets"]) - start) * 1000)
+        print(f"{label:<10} first window: {statistics.median(mapped):6.0f} ms | "
+              f"with pictures: {statistics.median(assets):6.0f} ms  (median of {runs})")
+
+
+def bench_morph(rounds=20):
+    """Frame times of the Barney -> T-Rex cross-fade (and back) in the real 500x650
+    window, measured through the quiz's frame_hook."""
+    quiz = load_quiz_module()
+    root = quiz.build_window()
+    quiz.image_cache.preloader.join()
+    intervals = []
+    quiz.frame_hook = intervals.append
+    quiz.start_quiz("easy")
+    root.update()
+
+    start = time.perf_counter()
+    quiz.mascot_sprites.photos()
+    to_photos = time.perf_counter() - start
+    for _ in range(rounds):
+        for to_trex in (True, False):
+            quiz.morph(to_trex)
+            while "morph" in quiz.pending_jobs:
+                root.update()
+                time.sleep(0.0005)
+
+    frame_ms = [t * 1000 for t in intervals]
+    late = sum(t > quiz.MORPH_FRAME_MS * 1.5 for t in frame_ms)
+    print(f"morph sprites: {quiz.MORPH_FRAMES} frames blended in {quiz.mascot_sprites.make_seconds * 1000:.1f} ms"
+          f" (preload thread), PhotoImages in {to_photos * 1000:.1f} ms")
+    print(f"  {len(frame_ms)} frames: {1000 / statistics.mean(frame_ms):.1f} fps"
+          f" | median {statistics.median(frame_ms):.2f} ms | p99 {percentile(frame_ms, 0.99):.2f} ms"
+          f" | late (> 1.5 frames): {late}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    bench_startup()
+    bench_transitions()
+    bench_keyboard_round()
+    bench_morph()
+    bench_server()
+    bench_results_log()
+    bench_adaptive()
+    bench_answer_check()
@@ -0,0 +1,117 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+class ImageCache:
+    """Bounded LRU cache of the resized mascot images.
+
+    Entries are keyed by (path, width, height, mtime), so a picture that is replaced
+    on disk gets loaded again. There are two levels:
+      images  resized PIL images, which any thread can make (see preload)
+      photos  the Tk PhotoImage for each, only ever touched on the Tk thread
+    hits counts requests served without decoding a file, misses the ones that did.
+    PIL is only imported when the first image is decoded (usually by the preload
+    thread), so importing this module costs nothing at startup.
+    """
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self.images = OrderedDict()
+        self.photos = OrderedDict()
+        self.lock = threading.Lock()  # guards self.images (the preloader writes to it)
+        self.hits = 0
+        self.misses = 0
+        self.preloaded = 0
+        self.preloader = None
+
+    @staticmethod
+    def make_key(path, width, height):
+        # A missing file gets no mtime: it is never cached, and decoding it raises
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+        return (path, width, height, mtime)
+
+    def remember(self, cache, key, value):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_entries:
+            cache.popitem(last=False)
+
+    # ---------- Decoding (any thread) ----------
+
+    def cached_image(self, key):
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None:
+                self.images.move_to_end(key)
+            return image
+
+    def ready(self, path, width, height):
+        """True when the image has been decoded and photo() will not touch the disk
+        (never for a file that is missing)."""
+        key = self.make_key(path, width, height)
+        return key in self.photos or self.cached_image(key) is not None
+
+    def decode(self, key):
+        from PIL import Image
+
+        path, width, height, _ = key
+        with Image.open(path) as img:
+            # Lets the JPEG decoder scale down while decoding, LANCZOS does the rest
+            img.draft("RGB", (width, height))
+            image = img.resize((width, height), Image.Resampling.LANCZOS)
+        with self.lock:
+            self.remember(self.images, key, image)
+        return image
+
+    def image(self, path, width, height):
+        """The resized PIL image, decoded now if it is not cached (any thread)."""
+        key = self.make_key(path, width, height)
+        image = self.cached_image(key)
+        return image if image is not None else self.decode(key)
+
+    def preload(self, sizes, then=None):
+        """Decodes (path, width, height) images on a background thread, then calls
+        then() on the same thread if given (e.g. to build sprites from them)."""
+        def run():
+            for path, width, height in sizes:
+                try:
+                    key = self.make_key(path, width, height)
+                    if self.cached_image(key) is None:
+                        self.decode(key)
+                        self.preloaded += 1
+                except Exception as e:
+                    print(f"Could not preload {path}: {e}")
+            if then:
+                then()
+
+        self.preloader = threading.Thread(target=run, daemon=True)
+        self.preloader.start()
+
+    # ---------- Tk Thread ----------
+
+    def photo(self, path, width, height):
+        """PhotoImage of path resized to width x height."""
+        key = self.make_key(path, width, height)
+        photo = self.photos.get(key)
+        if photo is not None:
+            self.photos.move_to_end(key)
+            self.hits += 1
+            return photo
+
+        image = self.cached_image(key)
+        if image is None:
+            self.misses += 1
+            image = self.decode(key)
+        else:
+            self.hits += 1
+        from PIL import ImageTk
+        photo = ImageTk.PhotoImage(image)
+        self.remember(self.photos, key, photo)
+        return photo
+
+    def report(self):
+        return f"{self.hits} hits, {self.misses} misses, {self.preloaded} preloaded"
@@ -0,0 +1,309 @@
+"""Barney's Math Adventure without the window: problem generation and scoring.
+
+The Tk quiz drives a QuizEngine, and so can anything else (a CLI, a server, a test).
+generate_batch() makes whole worksheets at once, using NumPy when it is installed
+and plain Python otherwise.
+
+    python quiz_engine.py worksheet --level moderate --count 20 --answers
+    python quiz_engine.py play --level easy
+    python quiz_engine.py loadtest --count 1000000
+"""
+import argparse
+import random
+import time
+from array import array
+from collections import namedtuple
+from fractions import Fraction
+
+from answers import parse_answer, format_answer
+
+try:
+    import numpy as np
+except ImportError:  # optional, only makes generate_batch faster
+    np = None
+
+QUESTIONS = 10
+FIRST_TRY_POINTS = 10
+SECOND_TRY_POINTS = 5
+
+OPERATIONS = "+-*/"
+LEVEL_RANGES = {"easy": (1, 9), "moderate": (10, 99), "advanced": (1000, 9999)}
+# Division is built backwards (divisor x quotient) so the answer is a whole number
+DIVISION_RANGES = {"easy": (1, 9), "moderate": (2, 12), "advanced": (2, 12)}
+
+CORRECT, RETRY, WRONG = "correct", "retry", "wrong"
+
+Problem = namedtuple("Problem", "a op b answer")
+Feedback = namedtuple("Feedback", "outcome points answer")
+QuestionResult = namedtuple("QuestionResult", "a op b attempts seconds points")
+
+
+# ---------- Single Problems ----------
+
+def calculate(a, op, b):
+    if op == "+": return a + b
+    if op == "-": return a - b
+    if op == "*": return a * b
+    return a // b if a % b == 0 else Fraction(a, b)
+
+
+def random_operands(level, rng=random):
+    low, high = LEVEL_RANGES[level]
+    return rng.randint(low, high), rng.randint(low, high)
+
+
+def decide_operation(rng=random):
+    return rng.choice(OPERATIONS)
+
+
+def make_problem(level, rng=random):
+    a, b = random_operands(level, rng)
+    op = decide_operation(rng)
+    if op == "/":
+        low, high = DIVISION_RANGES[level]
+        b = rng.randint(low, high)
+        a = b * rng.randint(low, high)
+    return Problem(a, op, b, calculate(a, op, b))
+
+
+def is_correct(problem, answer):
+    """Exact comparison. answer is an int or Fraction (see answers.parse_answer)."""
+    return answer == problem.answer
+
+
+def points_for(correct, attempt):
+    if not correct: return 0
+    return FIRST_TRY_POINTS if attempt == 1 else SECOND_TRY_POINTS
+
+
+# ---------- One Player ----------
+
+class QuizEngine:
+    """State of one quiz: 10 questions, two attempts each.
+    history keeps a QuestionResult for every question answered so far."""
+
+    def __init__(self, rng=None, scheduler=None, checker=is_correct):
+        self.rng = rng or random.Random()
+        # Picks each problem (e.g. an AdaptiveScheduler); None means uniform make_problem()
+        self.scheduler = scheduler
+        self.checker = checker  # checker(problem, answer) -> bool
+        self.difficulty = None
+        self.score = 0
+        self.current_question = 1
+        self.attempt = 1
+        self.problem = None
+        self.finished = False
+        self.history = []
+        self.shown_at = None  # time.monotonic() when the current problem was shown
+
+    def start(self, level):
+        self.difficulty = level
+        self.score = 0
+        self.current_question = 1
+        self.attempt = 1
+        self.finished = False
+        self.history = []
+        self.problem = self.new_problem()
+        self.mark_shown()
+        return self.problem
+
+    def new_problem(self):
+        if self.scheduler:
+            return self.scheduler.next_problem(self.difficulty, self.rng)
+        return make_problem(self.difficulty, self.rng)
+
+    def mark_shown(self):
+        """Starts the answer clock for the current problem (call when it appears)."""
+        self.shown_at = time.monotonic()
+
+    def submit(self, answer):
+        """Checks an answer (a number, or text for parse_answer). The outcome is CORRECT,
+        RETRY (first wrong answer, same problem again) or WRONG (second wrong answer,
+        moves on). Text that is not a number, or any answer once the quiz is finished,
+        raises ValueError."""
+        if self.finished:
+            raise ValueError("quiz is finished")
+        problem = self.problem
+        if isinstance(answer, str):
+            answer = parse_answer(answer)
+        correct = self.checker(problem, answer)
+        points = points_for(correct, self.attempt)
+        self.score += points
+
+        if correct:
+            outcome = CORRECT
+        elif self.attempt == 1:
+            self.attempt += 1
+            return Feedback(RETRY, 0, problem.answer)
+        else:
+            outcome = WRONG
+
+        seconds = time.monotonic() - self.shown_at
+        self.history.append(QuestionResult(problem.a, problem.op, problem.b, self.attempt,
+                                           seconds, points))
+        if self.scheduler:
+            self.scheduler.record(points == FIRST_TRY_POINTS, seconds)
+        self.current_question += 1
+        self.attempt = 1
+        if self.current_question > QUESTIONS:
+            self.finished = True
+        else:
+            self.problem = self.new_problem()
+            self.mark_shown()
+        return Feedback(outcome, points, problem.answer)
+
+
+# ---------- Batches ----------
+
+class ProblemBatch:
+    """Generated problems stored as columns: a, op (index into OPERATIONS), b, answer.
+    The columns are NumPy arrays or stdlib arrays, depending on how it was made."""
+
+    def __init__(self, level, a, ops, b, answers):
+        self.level = level
+        self.a = a
+        self.ops = ops
+        self.b = b
+        self.answers = answers
+
+    def __len__(self):
+        return len(self.a)
+
+    def __getitem__(self, i):
+        return Problem(int(self.a[i]), OPERATIONS[self.ops[i]], int(self.b[i]), int(self.answers[i]))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def generate_batch(level, count, seed=None, use_numpy=None):
+    """count random problems for a level with the same rules as make_problem()."""
+    if use_numpy is None:
+        use_numpy = np is not None
+    low, high = LEVEL_RANGES[level]
+    div_low, div_high = DIVISION_RANGES[level]
+
+    if use_numpy:
+        rng = np.random.default_rng(seed)
+        a = rng.integers(low, high + 1, count)
+        b = rng.integers(low, high + 1, count)
+        ops = rng.integers(0, len(OPERATIONS), count).astype(np.int8)
+        div = ops == OPERATIONS.index("/")
+        b[div] = rng.integers(div_low, div_high + 1, int(div.sum()))
+        a[div] = b[div] * rng.integers(div_low, div_high + 1, int(div.sum()))
+        answers = np.select([ops == 0, ops == 1, ops == 2], [a + b, a - b, a * b],
+                            default=a // np.maximum(b, 1))
+        return ProblemBatch(level, a, ops, b, answers)
+
+    rng = random.Random(seed)
+    operands = range(low, high + 1)
+    a = rng.choices(operands, k=count)
+    b = rng.choices(operands, k=count)
+    ops = bytes(rng.choices(range(len(OPERATIONS)), k=count))
+    divisors = range(div_low, div_high + 1)
+    for i in [i for i, op in enumerate(ops) if op == 3]:
+        b[i] = rng.choice(divisors)
+        a[i] = b[i] * rng.choice(divisors)
+    funcs = [lambda x, y: x + y, lambda x, y: x - y, lambda x, y: x * y, lambda x, y: x // y]
+    answers = array("q", map(lambda x, op, y: funcs[op](x, y), a, ops, b))
+    return ProblemBatch(level, array("q", a), array("b", ops), array("q", b), answers)
+
+
+def score_batch(batch, first, second=None):
+    """Points per problem with the quiz rules, for many problems at once.
+
+    first holds the first answer to each problem; second the retry answer, only
+    used where the first one was wrong (NaN or None where there was none).
+    Answers are compared exactly, batch answers are always whole numbers.
+    """
+    if np is not None and isinstance(batch.answers, np.ndarray):
+        answers = batch.answers
+        first_ok = np.asarray(first, dtype=float) == answers
+        points = np.where(first_ok, FIRST_TRY_POINTS, 0)
+        if second is not None:
+            second_ok = np.asarray(second, dtype=float) == answers
+            points = np.where(~first_ok & second_ok, SECOND_TRY_POINTS, points)
+        return points
+
+    if second is None:
+        second = [None] * len(batch)
+    points = array("b")
+    for correct, one, two in zip(batch.answers, first, second):
+        if one == correct:
+            points.append(FIRST_TRY_POINTS)
+        elif two == correct:
+            points.append(SECOND_TRY_POINTS)
+        else:
+            points.append(0)
+    return points
+
+
+# ---------- Command Line ----------
+
+def show(problem):
+    op_symbol = {"*": "×", "/": "÷"}.get(problem.op, problem.op)
+    return f"{problem.a} {op_symbol} {problem.b}"
+
+
+def worksheet(args):
+    batch = generate_batch(args.level, args.count, seed=args.seed)
+    for number, problem in enumerate(batch, start=1):
+        line = f"{number:>4}. {show(problem)} ="
+        print(f"{line} {problem.answer}" if args.answers else f"{line} ____")
+
+
+def play(args):
+    quiz = QuizEngine(random.Random(args.seed))
+    quiz.start(args.level)
+    while not quiz.finished:
+        text = input(f"Problem {quiz.current_question}/{QUESTIONS}: {show(quiz.problem)} = ")
+        try:
+            result = quiz.submit(text)
+        except ValueError:
+            print("Please enter a number!")
+            continue
+        if result.outcome == CORRECT: print("Super! Points for you!")
+        elif result.outcome == RETRY: print("I hear a growl on the distance... Try again.")
+        else: print(f"ROARS!!!! Answer: {format_answer(result.answer)}")
+    print(f"Final Score: {quiz.score} / {QUESTIONS * FIRST_TRY_POINTS}")
+
+
+def loadtest(args):
+    start = time.perf_counter()
+    batch = generate_batch(args.level, args.count, seed=args.seed)
+    generated = time.perf_counter() - start
+
+    # Every third first answer is off by one, every retry is right
+    rng = random.Random(args.seed)
+    first = [answer + (rng.random() < 1 / 3) for answer in batch.answers]
+    start = time.perf_counter()
+    points = score_batch(batch, first, batch.answers)
+    scored = time.perf_counter() - start
+
+    backend = "numpy" if np is not None else "stdlib"
+    print(f"{args.count:,} {args.level} problems ({backend})")
+    print(f"  generate: {generated * 1000:8.1f} ms  ({args.count / generated:,.0f} problems/s)")
+    print(f"  score:    {scored * 1000:8.1f} ms  ({args.count / scored:,.0f} answers/s), "
+          f"{int(sum(points)):,} points")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Barney's Math Adventure without the window")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, func, count in [("worksheet", worksheet, 20), ("play", play, None),
+                              ("loadtest", loadtest, 1_000_000)]:
+        command = commands.add_parser(name)
+        command.add_argument("--level", choices=LEVEL_RANGES, default="easy")
+        command.add_argument("--seed", type=int)
+        if count:
+            command.add_argument("--count", type=int, default=count)
+        command.set_defaults(func=func)
+    commands.choices["worksheet"].add_argument("--answers", action="store_true",
+                                               help="print the answers too")
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
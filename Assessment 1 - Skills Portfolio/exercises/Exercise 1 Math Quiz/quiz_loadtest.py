@@ -0,0 +1,164 @@
+"""Load test for quiz_server.py: many simulated players over keep-alive connections.
+
+Each connection keeps several sessions open at once and answers them in turn, so
+connections x interleave quizzes are live on the server together.
+
+    python quiz_loadtest.py                      # starts a server in this process
+    python quiz_loadtest.py --port 8765 --external   # tests a server that is already running
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+from quiz_engine import calculate
+from quiz_server import QuizServer
+
+
+class Client:
+    """Minimal HTTP/1.1 JSON client over one kept-alive connection."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host, port):
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.writer.write((
+            f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+        ).encode("latin-1") + body)
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ")[1])
+        length = 0
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+class LoadTest:
+    def __init__(self, host, port, sessions, connections, interleave, wrong_rate, seed=None):
+        self.host = host
+        self.port = port
+        self.sessions = sessions
+        self.connections = connections
+        self.interleave = interleave
+        self.wrong_rate = wrong_rate
+        self.rng = random.Random(seed)
+        self.started = 0
+        self.finished = 0
+        self.live = 0
+        self.peak_live = 0
+        self.latencies = []  # seconds per answer request
+        self.errors = 0
+
+    def pick_answer(self, problem):
+        answer = calculate(problem["a"], problem["op"], problem["b"])
+        return answer + 1 if self.rng.random() < self.wrong_rate else answer
+
+    async def start_session(self, client):
+        if self.started >= self.sessions:
+            return None
+        self.started += 1
+        status, state = await client.request("POST", "/sessions",
+                                             {"level": self.rng.choice(["easy", "moderate", "advanced"])})
+        if status != 201:
+            self.errors += 1
+            return None
+        self.live += 1
+        self.peak_live = max(self.peak_live, self.live)
+        return state
+
+    async def worker(self):
+        client = await Client.connect(self.host, self.port)
+        try:
+            open_sessions = []
+            while True:
+                while len(open_sessions) < self.interleave:
+                    state = await self.start_session(client)
+                    if state is None:
+                        break
+                    open_sessions.append(state)
+                if not open_sessions:
+                    return
+
+                # One answer to each open session in turn
+                still_open = []
+                for state in open_sessions:
+                    path = f"/sessions/{state['session']}/answer"
+                    start = time.perf_counter()
+                    status, reply = await client.request("POST", path, {"answer": self.pick_answer(state["problem"])})
+                    self.latencies.append(time.perf_counter() - start)
+                    if status != 200:
+                        self.errors += 1
+                        self.live -= 1
+                    elif reply["finished"]:
+                        await client.request("DELETE", f"/sessions/{state['session']}")
+                        self.finished += 1
+                        self.live -= 1
+                    else:
+                        still_open.append(reply)
+                open_sessions = still_open
+        finally:
+            await client.close()
+
+    async def run(self):
+        start = time.perf_counter()
+        await asyncio.gather(*(self.worker() for _ in range(self.connections)))
+        return time.perf_counter() - start
+
+    def report(self, elapsed):
+        latencies = sorted(t * 1000 for t in self.latencies)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0
+        print(f"{self.finished:,} sessions finished in {elapsed:.2f} s "
+              f"({self.connections} connections x {self.interleave} sessions each, peak {self.peak_live:,} live)")
+        print(f"  sessions/sec: {self.finished / elapsed:10,.0f}")
+        print(f"  answers/sec:  {len(latencies) / elapsed:10,.0f}")
+        if latencies:
+            print(f"  answer latency: p50 {statistics.median(latencies):.2f} ms | p99 {p99:.2f} ms")
+        if self.errors:
+            print(f"  errors: {self.errors}")
+
+
+async def run_load_test(sessions=5_000, connections=100, interleave=20, wrong_rate=0.2,
+                        host="127.0.0.1", port=0, external=False, seed=None):
+    server = None
+    if not external:
+        server = QuizServer(random.Random(seed))
+        port = await server.start(host, port)
+    test = LoadTest(host, port, sessions, connections, interleave, wrong_rate, seed)
+    try:
+        elapsed = await test.run()
+    finally:
+        if server:
+            await server.stop()
+    test.report(elapsed)
+    return test
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for the quiz server")
+    parser.add_argument("--sessions", type=int, default=5_000)
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--interleave", type=int, default=20, help="open sessions per connection")
+    parser.add_argument("--wrong-rate", type=float, default=0.2)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--external", action="store_true", help="use a server that is already running")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    asyncio.run(run_load_test(args.sessions, args.connections, args.interleave, args.wrong_rate,
+                              args.host, args.port, args.external, args.seed))
@@ -0,0 +1,251 @@
+"""Barney's Math Adventure for a whole classroom: a small HTTP/JSON quiz server.
+
+Every player gets a session holding their own QuizEngine, so one process can run
+thousands of quizzes at once with the same 10-question / two-attempt scoring as the
+Tk version. Plain asyncio streams, no extra packages.
+
+    python quiz_server.py --port 8765 [--log quiz_results.db]
+
+    POST   /sessions              {"level": "easy"}  -> new session and its first problem
+    GET    /sessions/<id>                            -> current state
+    POST   /sessions/<id>/answer  {"answer": "7/2"}  -> outcome, score and the next problem
+    DELETE /sessions/<id>
+"""
+import argparse
+import asyncio
+import json
+import random
+import secrets
+import time
+
+from answers import MAX_ANSWER_LENGTH, parse_answer, format_answer
+from quiz_engine import QuizEngine, LEVEL_RANGES, WRONG
+from results_log import ResultLog
+
+SESSION_TIMEOUT = 30 * 60  # seconds before an idle session is dropped
+EXPIRE_EVERY = 60
+MAX_BODY = 4096
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class QuizServer:
+    def __init__(self, rng=None, log=None):
+        self.rng = rng or random.Random()  # shared, so a session costs one small object
+        self.log = log  # optional ResultLog that finished quizzes are saved to
+        self.sessions = {}   # session id -> QuizEngine
+        self.last_seen = {}  # session id -> time.monotonic() of its last request
+        self.server = None
+        self.expirer = None
+
+    # ---------- Sessions ----------
+
+    def create_session(self, level):
+        if not isinstance(level, str) or level not in LEVEL_RANGES:
+            raise HTTPError(400, f"level must be one of {', '.join(LEVEL_RANGES)}")
+        quiz = QuizEngine(self.rng)
+        quiz.start(level)
+        session_id = secrets.token_hex(8)
+        self.sessions[session_id] = quiz
+        self.last_seen[session_id] = time.monotonic()
+        return session_id, quiz
+
+    def get_session(self, session_id):
+        quiz = self.sessions.get(session_id)
+        if quiz is None:
+            raise HTTPError(404, "no such session")
+        self.last_seen[session_id] = time.monotonic()
+        return quiz
+
+    def delete_session(self, session_id):
+        self.sessions.pop(session_id, None)
+        self.last_seen.pop(session_id, None)
+
+    def expire_sessions(self, now=None):
+        cutoff = (now or time.monotonic()) - SESSION_TIMEOUT
+        for session_id in [s for s, seen in self.last_seen.items() if seen < cutoff]:
+            self.delete_session(session_id)
+
+    async def expire_loop(self):
+        while True:
+            await asyncio.sleep(EXPIRE_EVERY)
+            self.expire_sessions()
+
+    @staticmethod
+    def state(session_id, quiz):
+        state = {"session": session_id, "level": quiz.difficulty, "score": quiz.score,
+                 "finished": quiz.finished}
+        if not quiz.finished:
+            problem = quiz.problem
+            state["question"] = quiz.current_question
+            state["attempt"] = quiz.attempt
+            state["problem"] = {"a": problem.a, "op": problem.op, "b": problem.b}
+        return state
+
+    # ---------- Requests ----------
+
+    def handle(self, method, path, body):
+        """Returns (status, reply) for one request, or raises HTTPError."""
+        parts = path.split("?", 1)[0].strip("/").split("/")
+        if parts[0] != "sessions" or len(parts) > 3:
+            raise HTTPError(404, "not found")
+
+        if len(parts) == 1:
+            if method != "POST":
+                raise HTTPError(405, "use POST to start a session")
+            session_id, quiz = self.create_session(body.get("level", "easy"))
+            return 201, self.state(session_id, quiz)
+
+        session_id = parts[1]
+        quiz = self.get_session(session_id)
+        if len(parts) == 2:
+            if method == "GET":
+                return 200, self.state(session_id, quiz)
+            if method == "DELETE":
+                self.delete_session(session_id)
+                return 200, {"session": session_id, "deleted": True}
+            raise HTTPError(405, "use GET or DELETE")
+
+        if parts[2] != "answer":
+            raise HTTPError(404, "not found")
+        if method != "POST":
+            raise HTTPError(405, "use POST to answer")
+        if quiz.finished:
+            raise HTTPError(400, "the quiz is finished")
+        answer = body.get("answer")  # a JSON number or text like "3 1/2"
+        if isinstance(answer, bool) or not isinstance(answer, (str, int, float)):
+            raise HTTPError(400, "answer must be a number")
+        answer = answer if isinstance(answer, str) else str(answer)
+        if len(answer) > MAX_ANSWER_LENGTH:
+            raise HTTPError(400, f"answer must be at most {MAX_ANSWER_LENGTH} characters")
+        try:
+            answer = parse_answer(answer)
+        except ValueError:
+            raise HTTPError(400, "answer must be a number")
+
+        result = quiz.submit(answer)
+        if quiz.finished and self.log:
+            self.log.record(quiz)
+        reply = self.state(session_id, quiz)
+        reply["outcome"] = result.outcome
+        reply["points"] = result.points
+        if result.outcome == WRONG:
+            answer = result.answer
+            reply["correct_answer"] = answer if isinstance(answer, int) else format_answer(answer)
+        return 200, reply
+
+    # ---------- HTTP ----------
+
+    async def serve_client(self, reader, writer):
+        """One connection. Requests are answered in order and the connection is kept
+        open (HTTP/1.1 keep-alive) until the client closes it."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, version = lines[0].split(" ")
+                except ValueError:
+                    self.respond(writer, 400, {"error": "bad request line"}, keep_alive=False)
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    self.respond(writer, 400, {"error": "bad Content-Length"}, keep_alive=False)
+                    return
+                if length > MAX_BODY:
+                    self.respond(writer, 413, {"error": "body too large"}, keep_alive=False)
+                    return
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, reply = self.handle(method, path, self.decode_body(body))
+                except HTTPError as e:
+                    status, reply = e.status, {"error": str(e)}
+                except Exception as e:
+                    # A bug in one request gets a reply, not a dropped connection
+                    print(f"Error handling {method} {path}: {e!r}")
+                    status, reply = 500, {"error": "internal server error"}
+
+                self.respond(writer, status, reply, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def decode_body(body):
+        """The request's JSON object. Only json.loads is inside the try, so a ValueError
+        from handle() is never mistaken for a bad body."""
+        try:
+            data = json.loads(body) if body else {}
+        except ValueError:
+            raise HTTPError(400, "body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "body must be a JSON object")
+        return data
+
+    @staticmethod
+    def respond(writer, status, reply, keep_alive):
+        body = json.dumps(reply).encode("utf-8")
+        writer.write((
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode("latin-1") + body)
+
+    async def start(self, host="127.0.0.1", port=8765):
+        """Starts listening and returns the port (pass port=0 for any free one)."""
+        self.server = await asyncio.start_server(self.serve_client, host, port, backlog=1024)
+        self.expirer = asyncio.create_task(self.expire_loop())
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.expirer.cancel()
+        self.server.close()
+        await self.server.wait_closed()
+
+
+async def serve(host, port, log_path=None):
+    log = ResultLog(log_path) if log_path else None
+    server = QuizServer(log=log)
+    port = await server.start(host, port)
+    print(f"Quiz server listening on http://{host}:{port}")
+    try:
+        await server.server.serve_forever()
+    finally:
+        if log:
+            log.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Barney's Math Adventure quiz server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--log", help="SQLite file to save finished quizzes to")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.log))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,171 @@
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id          INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    difficulty  TEXT NOT NULL,
+    score       INTEGER NOT NULL,
+    seconds     REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS questions (
+    session_id  INTEGER NOT NULL REFERENCES sessions(id),
+    number      INTEGER NOT NULL,
+    a           INTEGER NOT NULL,
+    op          TEXT NOT NULL,
+    b           INTEGER NOT NULL,
+    attempts    INTEGER NOT NULL,
+    seconds     REAL NOT NULL,
+    points      INTEGER NOT NULL
+);
+-- Leaderboard: best score first, quicker player wins a tie
+CREATE INDEX IF NOT EXISTS sessions_leaderboard ON sessions (difficulty, score DESC, seconds);
+CREATE INDEX IF NOT EXISTS questions_session ON questions (session_id);
+-- Running totals per difficulty, kept by the writer so statistics never scan sessions
+CREATE TABLE IF NOT EXISTS difficulty_stats (
+    difficulty  TEXT PRIMARY KEY,
+    sessions    INTEGER NOT NULL,
+    total_score INTEGER NOT NULL,
+    best_score  INTEGER NOT NULL,
+    total_seconds REAL NOT NULL
+);
+"""
+
+STOP = None
+
+
+class ResultLog:
+    """SQLite log of finished quizzes.
+
+    record() only puts a snapshot of the quiz on a queue, so the Tk thread never
+    waits for the disk. A background thread writes whatever has queued up in one
+    transaction per batch. Reads (leaderboard, stats) use their own connection.
+    """
+
+    def __init__(self, path, batch_size=500):
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = queue.Queue()
+        self.write_error = None
+        self.reader = None
+        self.writer = threading.Thread(target=self.run, daemon=True)
+        self.writer.start()
+
+    # ---------- Writing ----------
+
+    def record(self, quiz, finished_at=None):
+        """Queues a finished QuizEngine (its history is copied, the quiz can be reused)."""
+        history = [tuple(question) for question in quiz.history]
+        seconds = sum(question.seconds for question in quiz.history)
+        self.pending.put((finished_at or time.time(), quiz.difficulty, quiz.score, seconds, history))
+
+    def connect(self):
+        connection = sqlite3.connect(self.path)
+        try:
+            # WAL lets the results screen read while the writer is inserting
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+        except sqlite3.Error:
+            connection.close()
+            raise
+        return connection
+
+    def run(self):
+        try:
+            connection = self.connect()
+        except sqlite3.Error as e:
+            # Results can't be saved, but flush() and close() must not wait forever
+            self.write_error = e
+            print(f"Could not open the results log: {e}")
+            while True:
+                item = self.pending.get()
+                self.pending.task_done()
+                if item is STOP:
+                    return
+
+        try:
+            while True:
+                batch = [self.pending.get()]
+                while batch[-1] is not STOP and len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.pending.get_nowait())
+                    except queue.Empty:
+                        break
+                stopping = batch[-1] is STOP
+                try:
+                    self.write_batch(connection, [item for item in batch if item is not STOP])
+                except sqlite3.Error as e:
+                    self.write_error = e
+                    print(f"Could not save quiz results: {e}")
+                for _ in batch:
+                    self.pending.task_done()
+                if stopping:
+                    return
+        finally:
+            connection.close()
+
+    @staticmethod
+    def write_batch(connection, batch):
+        if not batch:
+            return
+        with connection:  # one transaction for the whole batch
+            for finished_at, difficulty, score, seconds, history in batch:
+                session_id = connection.execute(
+                    "INSERT INTO sessions (finished_at, difficulty, score, seconds) VALUES (?, ?, ?, ?)",
+                    (finished_at, difficulty, score, seconds)).lastrowid
+                connection.executemany(
+                    "INSERT INTO questions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(session_id, number, *question) for number, question in enumerate(history, start=1)])
+                connection.execute(
+                    "INSERT INTO difficulty_stats VALUES (?, 1, ?, ?, ?) "
+                    "ON CONFLICT (difficulty) DO UPDATE SET sessions = sessions + 1, "
+                    "total_score = total_score + excluded.total_score, "
+                    "best_score = MAX(best_score, excluded.best_score), "
+                    "total_seconds = total_seconds + excluded.total_seconds",
+                    (difficulty, score, score, seconds))
+
+    def flush(self):
+        """Waits until everything recorded so far is on disk."""
+        self.pending.join()
+
+    def close(self):
+        self.pending.put(STOP)
+        self.writer.join()
+        if self.reader:
+            self.reader.close()
+            self.reader = None
+
+    # ---------- Reading ----------
+
+    def read_connection(self):
+        if self.reader is None:
+            self.reader = self.connect()
+        return self.reader
+
+    def leaderboard(self, difficulty, limit=10):
+        """[(score, seconds, finished_at), ...] best first (an index range scan)."""
+        return self.read_connection().execute(
+            "SELECT score, seconds, finished_at FROM sessions WHERE difficulty = ? "
+            "ORDER BY score DESC, seconds LIMIT ?", (difficulty, limit)).fetchall()
+
+    def stats(self, difficulty):
+        """(sessions, average score, best score, average seconds) from the running totals."""
+        row = self.read_connection().execute(
+            "SELECT sessions, total_score, best_score, total_seconds FROM difficulty_stats "
+            "WHERE difficulty = ?", (difficulty,)).fetchone()
+        if row is None:
+            return 0, 0, 0, 0
+        sessions, total_score, best_score, total_seconds = row
+        return sessions, total_score / sessions, best_score, total_seconds / sessions
+
+    def rank(self, difficulty, score, seconds):
+        """Leaderboard position a result would have (1 = top)."""
+        count = self.read_connection().execute(
+            "SELECT COUNT(*) FROM sessions WHERE difficulty = ? AND "
+            "(score > ? OR (score = ? AND seconds < ?))",
+            (difficulty, score, score, seconds)).fetchone()[0]
+        return count + 1
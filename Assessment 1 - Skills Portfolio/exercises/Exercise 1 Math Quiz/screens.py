@@ -0,0 +1,30 @@
+import tkinter as tk
+
+
+class ScreenManager:
+    """Keeps every screen of the quiz alive and raises the one being shown.
+
+    Screens are frames stacked in the same grid cell of the root window. They are
+    built once; switching screens is a tkraise() instead of destroying and
+    rebuilding widgets, so a long session does not keep creating Tk objects.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.screens = {}
+        self.current = None
+        root.grid_rowconfigure(0, weight=1)
+        root.grid_columnconfigure(0, weight=1)
+
+    def add(self, name, bg):
+        """Creates the (empty) frame for a screen and returns it to be filled in."""
+        frame = tk.Frame(self.root, bg=bg)
+        frame.grid(row=0, column=0, sticky="nsew")
+        self.screens[name] = frame
+        return frame
+
+    def show(self, name):
+        if self.current != name:
+            self.screens[name].tkraise()
+            self.current = name
+        return self.screens[name]
@@ -0,0 +1,49 @@
+import time
+
+
+class SpriteSheet:
+    """The frames of a cross-fade from one picture to another, made once.
+
+    make() blends every frame with Image.blend and may run on any thread (the
+    quiz runs it after the startup preload). photos() turns them into PhotoImages
+    on the Tk thread the first time they are needed, so playing the animation
+    is only a label.configure() per frame: no decoding, no blending.
+    """
+
+    def __init__(self, cache, first_path, last_path, width, height, count=12):
+        self.cache = cache
+        self.first_path = first_path
+        self.last_path = last_path
+        self.size = (width, height)
+        self.count = count
+        self.images = None
+        self.sheet = None
+        self.make_seconds = None
+
+    def make(self):
+        from PIL import Image
+
+        start = time.perf_counter()
+        try:
+            first = self.cache.image(self.first_path, *self.size).convert("RGBA")
+            last = self.cache.image(self.last_path, *self.size).convert("RGBA")
+            self.images = [Image.blend(first, last, i / (self.count - 1)) for i in range(self.count)]
+        except Exception as e:
+            print(f"Could not make the sprites: {e}")
+        self.make_seconds = time.perf_counter() - start
+
+    def photos(self):
+        """The frames as PhotoImages (Tk thread), or None while make() has not finished."""
+        if self.sheet is None and self.images is not None:
+            from PIL import ImageTk
+            self.sheet = [ImageTk.PhotoImage(image) for image in self.images]
+            self.images = None  # the PhotoImages hold their own copy
+        return self.sheet
+
+
+def blend_colours(first, last, count):
+    """count "#rrggbb" colours going evenly from first to last."""
+    a = [int(first[i:i + 2], 16) for i in (1, 3, 5)]
+    b = [int(last[i:i + 2], 16) for i in (1, 3, 5)]
+    return ["#" + "".join(f"{round(x + (y - x) * i / (count - 1)):02x}" for x, y in zip(a, b))
+            for i in range(count)]
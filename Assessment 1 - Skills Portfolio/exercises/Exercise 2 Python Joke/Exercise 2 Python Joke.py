@@ -1,12 +1,14 @@
 import tkinter as tk
 from tkinter import font
-import random
+import argparse
 import os
+import time
 from PIL import Image, ImageTk 
-import pygame 
+from joke_audio import JokeAudio
+from joke_engine import JokeEngine
 
 class JokeApp:
-    def __init__(self, root):
+    def __init__(self, root, audio=True):
         self.root = root
         self.root.title("Python Joke Bot ʕ•͡•ʔ")
         self.root.geometry("600x500")
@@ -26,31 +28,12 @@ class JokeApp:
             print("Warning: Icon not found. Make sure 'Laughing.jpg' is in the folder.")
 
         # --- 2. AUDIO SETUP ---
-        pygame.mixer.init()
-
-        # Load Sound Effect
-        self.laugh_sound = None
-        sound_path = os.path.join(self.base_path, "let-me-know.mp3")
-        
-        if os.path.exists(sound_path):
-            try:
-                self.laugh_sound = pygame.mixer.Sound(sound_path)
-                self.laugh_sound.set_volume(0.5) 
-            except Exception as e:
-                print(f"Error loading laugh: {e}")
-
-        # Load Background Music
-        music_path = os.path.join(self.base_path, "05. Elevator Jam.mp3")
-        
-        if os.path.exists(music_path):
-            try:
-                pygame.mixer.music.load(music_path)
-                
-                pygame.mixer.music.set_volume(0.3)
-                
-                pygame.mixer.music.play(-1)
-            except Exception as e:
-                print(f"Error loading music: {e}")
+        # Started on its own thread once the window is on screen (see joke_audio.py)
+        self.audio = None
+        if audio:
+            self.audio = JokeAudio(self.base_path,
+                                   os.path.join(self.base_path, "05. Elevator Jam.mp3"))
+            self.root.bind("<Map>", self.start_audio, add="+")
         
         # --- UI COLORS ---
         self.bg_color = "#120520"       
@@ -63,48 +46,11 @@ class JokeApp:
         
         self.root.configure(bg=self.bg_color)
 
-        self.jokes = [
-            ("Why did the chicken cross the road?", "To get to the other side."),
-            ("What happens if you boil a clown?", "You get a laughing stock."),
-            ("Why did the car get a flat tire?", "Because there was a fork in the road!"),
-            ("How did the hipster burn his mouth?", "He ate his pizza before it was cool."),
-            ("What did the janitor say when he jumped out of the closet?", "SUPPLIES!!!!"),
-            ("Have you heard about the band 1023MB?", "It's probably because they haven't got a gig yet…"),
-            ("Why does the golfer wear two pants?", "Because he's afraid he might get a 'Hole-in-one.'"),
-            ("Why should you wear glasses to maths class?", "Because it helps with division."),
-            ("Why does it take pirates so long to learn the alphabet?", "Because they could spend years at C."),
-            ("Why did the woman go on the date with the mushroom?", "Because he was a fun-ghi."),
-            ("Why do bananas never get lonely?", "Because they hang out in bunches."),
-            ("What did the buffalo say when his kid went to college?", "Bison."),
-            ("Why shouldn't you tell secrets in a cornfield?", "Too many ears."),
-            ("What do you call someone who doesn't like carbs?", "Lack-Toast Intolerant."),
-            ("Why did the can crusher quit his job?", "Because it was soda pressing."),
-            ("Why did the birthday boy wrap himself in paper?", "He wanted to live in the present."),
-            ("What does a house wear?", "A dress."),
-            ("Why couldn't the toilet paper cross the road?", "Because it got stuck in a crack."),
-            ("Why didn't the bike want to go anywhere?", "Because it was two-tired!"),
-            ("Want to hear a pizza joke?", "Nahhh, it's too cheesy!"),
-            ("Why are chemists great at solving problems?", "Because they have all of the solutions!"),
-            ("Why is it impossible to starve in the desert?", "Because of all the sand which is there!"),
-            ("What did the cheese say when it looked in the mirror?", "Halloumi!"),
-            ("Why did the developer go broke?", "Because he used up all his cache."),
-            ("Did you know that ants are the only animals that don't get sick?", "It's true! It's because they have little antibodies."),
-            ("Why did the donut go to the dentist?", "To get a filling."),
-            ("What do you call a bear with no teeth?", "A gummy bear!"),
-            ("What does a vegan zombie like to eat?", "Graaains."),
-            ("What do you call a dinosaur with only one eye?", "A Do-you-think-he-saw-us!"),
-            ("Why should you never fall in love with a tennis player?", "Because to them... love means NOTHING!"),
-            ("What did the full glass say to the empty glass?", "You look drunk."),
-            ("What's a potato's favorite form of transportation?", "The gravy train."),
-            ("What did one ocean say to the other?", "Nothing, they just waved."),
-            ("What did the right eye say to the left eye?", "Honestly, between you and me something smells."),
-            ("What do you call a dog that's been run over by a steamroller?", "Spot!"),
-            ("What's the difference between a hippo and a zippo?", "One's pretty heavy and the other's a little lighter."),
-            ("Why don't scientists trust Atoms?", "They make up everything.")
-        ]
-        
-        self.current_joke = None
-        self.is_setup_shown = False
+        # --- JOKES ---
+        # Read from the shared resources file one joke at a time (see joke_store.py),
+        # every joke once before any repeats, carrying on from the last session.
+        # The setup -> punchline -> next flow lives in the engine (see joke_engine.py).
+        self.engine = JokeEngine.open(schedule_path=os.path.join(self.base_path, "joke_schedule.json"))
 
         self.header_font = font.Font(family="Courier New", size=24, weight="bold")
         self.setup_font = font.Font(family="Courier New", size=26, weight="bold")
@@ -134,47 +80,95 @@ class JokeApp:
                                        relief="raised", bd=3, width=15, pady=5)
         self.action_button.pack(side="left", padx=10)
 
-        self.quit_button = tk.Button(self.button_frame, text="QUIT GAME", command=root.destroy,
+        self.quit_button = tk.Button(self.button_frame, text="QUIT GAME", command=self.quit_game,
                                        font=self.btn_font, bg=self.quit_bg, fg="white", 
                                        activebackground="#FF0000", activeforeground="white",
                                        relief="raised", bd=3, width=15, pady=5)
         self.quit_button.pack(side="left", padx=10)
 
+        self.root.protocol("WM_DELETE_WINDOW", self.quit_game)
+
     def handle_click(self):
         """Handles the button click based on current state."""
-        if not self.is_setup_shown:
+        if not self.engine.is_setup_shown:
             # State: Showing a new setup
             
             # --- CHANGE 2: STOP LAUGHING ---
-            # If the user clicks NEXT, stop the previous laugh immediately
-            if self.laugh_sound:
-                self.laugh_sound.stop()
+            # If the user clicks NEXT, the previous laughs fade out
+            if self.audio:
+                self.audio.stop_laugh()
                 
             self.get_new_joke()
             self.action_button.config(text="REVEAL ANSWER", bg="#ff9900") 
-            self.is_setup_shown = True
         else:
             # State: Showing the punchline
             self.show_punchline()
             self.action_button.config(text="NEXT LEVEL", bg=self.button_bg) 
-            self.is_setup_shown = False
             
-            if self.laugh_sound:
-                self.laugh_sound.stop() # Stop any overlapping sounds
-                self.laugh_sound.play()
+            if self.audio:
+                self.audio.play_laugh()  # queued until the audio thread is ready
 
     def get_new_joke(self):
-        """Selects a random joke and displays the setup."""
-        self.current_joke = random.choice(self.jokes)
-        self.setup_label.config(text=self.current_joke[0])
+        """Selects the next joke of the shuffled cycle and displays the setup."""
+        joke = self.engine.next_joke()
+        self.setup_label.config(text=joke.setup)
         self.punchline_label.config(text="")  
 
+    def quit_game(self):
+        """Saves the place in the joke cycle, then closes the window."""
+        try:
+            self.engine.save()
+        except OSError as e:
+            print(f"Error saving joke schedule: {e}")
+        if self.audio:
+            self.audio.close()
+        self.root.destroy()
+
     def show_punchline(self):
         """Displays the punchline of the current joke."""
-        if self.current_joke:
-            self.punchline_label.config(text=self.current_joke[1])
+        punchline = self.engine.reveal()
+        if punchline is not None:
+            self.punchline_label.config(text=punchline)
+
+    def start_audio(self, event):
+        # <Map> bound on the root also fires for each child widget; the root's own
+        # comes when the window itself is mapped
+        if event.widget is self.root and self.audio.thread is None:
+            self.audio.start()
+
+    def startup_probe(self):
+        """Prints when the window is first mapped and when the audio is ready, then
+        quits. Used by benchmarks.bench_startup to time startup from outside."""
+        shown = False
+
+        def mapped(event):
+            nonlocal shown
+            # A flag rather than unbind, which would drop start_audio's binding too
+            if event.widget is self.root and not shown:
+                shown = True
+                print(f"mapped {time.time()}", flush=True)
+                wait_for_audio()
+
+        def wait_for_audio():
+            if self.audio and not self.audio.ready.is_set():
+                self.root.after(5, wait_for_audio)
+                return
+            if self.audio:
+                print(f"audio {time.time()} {self.audio.driver}", flush=True)
+                self.audio.close()
+            self.root.destroy()
+
+        self.root.bind("<Map>", mapped, add="+")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Python Joke Bot")
+    parser.add_argument("--no-audio", action="store_true", help="no music or laughs")
+    parser.add_argument("--startup-probe", action="store_true",
+                        help="print startup times and quit (see benchmarks.py)")
+    args = parser.parse_args()
+
     root = tk.Tk()
-    app = JokeApp(root)
+    app = JokeApp(root, audio=not args.no_audio)
+    if args.startup_probe:
+        app.startup_probe()
     root.mainloop()
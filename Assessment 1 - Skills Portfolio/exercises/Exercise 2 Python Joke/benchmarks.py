@@ -0,0 +1,194 @@
+"""Performance checks for the Joke Bot.
+
+Run from this folder:  python benchmarks.py
+The startup benchmark needs a display (it opens the real window).
+"""
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from joke_engine import JokeEngine
+from joke_scheduler import JokeScheduler
+from joke_store import JokeStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(BASE_DIR, "Exercise 2 Python Joke.py")
+MUSIC_PATH = os.path.join(BASE_DIR, "05. Elevator Jam.mp3")
+JOKES_PATH = os.path.join(BASE_DIR, "..", "..", "A1 - Resources", "randomJokes.txt")
+
+
+def make_corpus(path, lines):
+    """Writes a joke file of the given size by repeating the shipped jokes (numbered)."""
+    with open(JOKES_PATH, encoding="utf-8") as file:
+        jokes = [line.strip() for line in file if line.strip()]
+    with open(path, "w", encoding="utf-8") as file:
+        for number in range(lines):
+            file.write(f"{number}. {jokes[number % len(jokes)]}\n")
+
+
+def bench_joke_store(lines=2_000_000, reads=100_000):
+    """Building the index once, opening with a saved index, and reading random jokes."""
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "jokes.txt")
+        make_corpus(path, lines)
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        JokeStore(path).close()
+        first_open = time.perf_counter() - start
+
+        rng = random.Random(1)
+        tracemalloc.start()
+        start = time.perf_counter()
+        store = JokeStore(path)
+        cached_open = time.perf_counter() - start
+        for _ in range(reads):
+            store.random_joke(rng)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        read_times = []
+        for _ in range(reads):
+            start = time.perf_counter()
+            store.random_joke(rng)
+            read_times.append(time.perf_counter() - start)
+        store.close()
+
+    read_us = sorted(t * 1e6 for t in read_times)
+    print(f"joke store with {lines:,} jokes ({size / 2**20:.0f} MiB)")
+    print(f"  first open (builds index): {first_open * 1000:8.1f} ms")
+    print(f"  open with saved index:     {cached_open * 1000:8.3f} ms")
+    print(f"  random joke: median {statistics.median(read_us):.2f} us"
+          f" | p99 {read_us[int(len(read_us) * 0.99)]:.2f} us")
+    print(f"  Python memory for opening and {reads:,} reads: {peak / 1024:.0f} KiB")
+
+
+def bench_scheduler(draws=200_000):
+    """Draw cost for corpora from 100 to 10^12 jokes (it should not grow), against
+    random.shuffle of a list, plus a check that a cycle shows every joke once."""
+    print("joke scheduler: time per next()")
+    for count in [100, 10_000, 1_000_000, 10**9, 10**12]:
+        scheduler = JokeScheduler(count, seed=1)
+        start = time.perf_counter()
+        for _ in range(draws):
+            scheduler.next()
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        scheduler = JokeScheduler(count, seed=1)
+        for _ in range(1000):
+            scheduler.next()
+        memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  {count:>17,} jokes: {elapsed / draws * 1e9:6.0f} ns | {memory / 1024:6.1f} KiB")
+
+    count = 1_000_000
+    start = time.perf_counter()
+    order = list(range(count))
+    random.shuffle(order)
+    print(f"  random.shuffle of {count:,} jokes up front: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    scheduler = JokeScheduler(count, seed=2, weights={7: 3, 8: 0})
+    first_cycle = [scheduler.next() for _ in range(count + 1)]
+    shown = set(first_cycle)
+    ok = len(shown) == count - 1 and 8 not in shown and first_cycle.count(7) == 3
+    repeats = sum(a == b for a, b in zip(first_cycle, first_cycle[1:]))
+    print(f"  one weighted cycle of {count:,}: {'every joke once' if ok else 'WRONG'},"
+          f" {repeats} back-to-back repeats")
+
+
+def bench_startup(runs=5):
+    """Process start to first mapped window with audio (started in the background)
+    and with --no-audio, and to the audio being ready."""
+    import subprocess
+    import sys
+
+    for label, flags in [("with audio", []), ("no audio", ["--no-audio"])]:
+        mapped, audio, drivers = [], [], set()
+        for _ in range(runs):
+            start = time.time()
+            try:
+                output = subprocess.run([sys.executable, APP_PATH, "--startup-probe", *flags],
+                                        capture_output=True, text=True, timeout=60)
+            except subprocess.TimeoutExpired:
+                print("startup: the app did not quit, is the window being shown?")
+                return
+            times = {line.split()[0]: line.split()[1:] for line in output.stdout.splitlines()
+                     if line.startswith(("mapped ", "audio "))}
+            if "mapped" not in times:
+                print(f"startup: could not open the window ({output.stderr.strip().splitlines()[-1:]})")
+                return
+            mapped.append((float(times["mapped"][0]) - start) * 1000)
+            if "audio" in times:
+                audio.append((float(times["audio"][0]) - start) * 1000)
+                drivers.add(times["audio"][1])
+        line = f"{label:<10} first window: {statistics.median(mapped):6.0f} ms"
+        if audio:
+            line += f" | audio ready: {statistics.median(audio):6.0f} ms ({', '.join(drivers)} driver)"
+        print(line + f"  (median of {runs})")
+
+
+def bench_sound_bank(reveals=2_000):
+    """Decoding every effect once, then back-to-back reveals through the voice pool.
+    Uses SDL's dummy audio driver unless SDL_AUDIODRIVER is already set."""
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from joke_audio import EFFECT_VOICES
+    from sound_bank import SoundBank, VoicePool
+
+    pygame.mixer.init()
+    start = time.perf_counter()
+    bank = SoundBank(pygame, BASE_DIR, exclude=[MUSIC_PATH])
+    loaded = time.perf_counter() - start
+    pool = VoicePool(pygame, EFFECT_VOICES)
+
+    play_times = []
+    for _ in range(reveals):
+        start = time.perf_counter()
+        pool.play(bank.next())
+        play_times.append(time.perf_counter() - start)
+    pool.stop()
+    pygame.mixer.quit()
+
+    play_us = sorted(t * 1e6 for t in play_times)
+    print(f"sound bank ({os.environ['SDL_AUDIODRIVER']} driver): {len(bank)} clips decoded in "
+          f"{loaded * 1000:.0f} ms ({', '.join(bank.names)})")
+    print(f"  {reveals:,} overlapping reveals on {EFFECT_VOICES} voices: median {statistics.median(play_us):.1f} us"
+          f" | p99 {play_us[int(len(play_us) * 0.99)]:.1f} us | {pool.stolen:,} voices stolen")
+
+
+def bench_engine(jokes=500_000, corpus=2_000_000):
+    """Jokes per second through the JokeEngine (no Tk): next_joke + reveal, and
+    the JSON-lines stream, for the shipped jokes and for a large corpus."""
+    with tempfile.TemporaryDirectory() as folder:
+        big_path = os.path.join(folder, "jokes.txt")
+        make_corpus(big_path, corpus)
+        JokeStore(big_path).close()  # the index is built once, not timed
+
+        print(f"joke engine, {jokes:,} jokes each")
+        for label, path in [("shipped file", JOKES_PATH), (f"{corpus:,} jokes", big_path)]:
+            engine = JokeEngine.open(path, seed=1)
+            start = time.perf_counter()
+            for _ in range(jokes):
+                engine.next_joke()
+                engine.reveal()
+            told = time.perf_counter() - start
+
+            with open(os.devnull, "w", encoding="utf-8") as out:
+                start = time.perf_counter()
+                engine.stream(jokes, out)
+                streamed = time.perf_counter() - start
+            engine.close()
+            print(f"  {label:<17} setup -> reveal: {jokes / told:10,.0f} jokes/s"
+                  f" | JSON lines: {jokes / streamed:10,.0f} jokes/s")
+
+
+if __name__ == "__main__":
+    bench_startup()
+    bench_joke_store()
+    bench_scheduler()
+    bench_sound_bank()
+    bench_engine()
@@ -0,0 +1,116 @@
+import os
+import queue
+import threading
+
+from sound_bank import SoundBank, VoicePool
+
+STOP = None
+EFFECT_VOICES = 4    # laughs that can play at once
+LAUGH_FADE_MS = 250  # NEXT fades the laughs out instead of cutting them off
+
+
+class JokeAudio:
+    """Background music and the laughs, started on a thread so the window never waits.
+
+    pygame is imported, the mixer opened and the clips decoded on the audio thread.
+    Every other clip in the folder is a laugh (see SoundBank); they play on a small
+    pool of channels, so quick reveals overlap instead of restarting one sound.
+    play_laugh() and stop_laugh() only queue a request, so they can be called
+    straight away; the audio thread works through the queue once it is ready.
+    With no sound device (e.g. a headless machine) SDL's dummy driver is used,
+    so everything still runs, silently.
+    """
+
+    def __init__(self, effects_folder, music_path, pick="random", voices=EFFECT_VOICES):
+        self.effects_folder = effects_folder
+        self.music_path = music_path
+        self.pick = pick
+        self.voices = voices
+        self.bank = None
+        self.pool = None
+        self.requests = queue.Queue()
+        self.ready = threading.Event()  # set once started (or once it has given up)
+        self.failed = False
+        self.driver = None
+        self.thread = None
+
+    # ---------- Tk Thread ----------
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def play_laugh(self):
+        if not self.failed:
+            self.requests.put("play_laugh")
+
+    def stop_laugh(self):
+        if not self.failed:
+            self.requests.put("stop_laugh")
+
+    def close(self):
+        if self.thread:
+            self.requests.put(STOP)
+            self.thread.join(timeout=1)
+
+    # ---------- Audio Thread ----------
+
+    def run(self):
+        try:
+            pygame = self.open_mixer()
+        except Exception as e:
+            print(f"Audio is off: {e}")
+            self.failed = True
+            self.ready.set()
+            return
+
+        self.load_effects(pygame)
+        self.start_music(pygame)
+        self.ready.set()
+
+        while True:
+            request = self.requests.get()
+            if request is STOP:
+                break
+            if not self.bank:
+                continue
+            # One failed request must not end the thread, or every later laugh is lost
+            try:
+                if request == "stop_laugh":
+                    self.pool.fadeout(LAUGH_FADE_MS)
+                elif request == "play_laugh":
+                    self.pool.play(self.bank.next())
+            except Exception as e:
+                print(f"Audio error on {request}: {e}")
+        pygame.mixer.quit()
+
+    def open_mixer(self):
+        import pygame
+
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"No sound device ({e}), using the dummy audio driver")
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+            pygame.mixer.init()
+        self.driver = os.environ.get("SDL_AUDIODRIVER", "default")
+        return pygame
+
+    def load_effects(self, pygame):
+        try:
+            self.bank = SoundBank(pygame, self.effects_folder, exclude=[self.music_path],
+                                  volume=0.5, pick=self.pick)
+            self.pool = VoicePool(pygame, self.voices)
+        except Exception as e:
+            print(f"Error loading laughs: {e}")
+            self.bank = None
+
+    def start_music(self, pygame):
+        if not os.path.exists(self.music_path):
+            return
+        try:
+            pygame.mixer.music.load(self.music_path)
+            pygame.mixer.music.set_volume(0.3)
+            pygame.mixer.music.play(-1)
+        except Exception as e:
+            print(f"Error loading music: {e}")
@@ -0,0 +1,145 @@
+"""The Joke Bot without the window: setup -> reveal -> next.
+
+The Tk JokeApp drives a JokeEngine, and so can anything else. From a terminal:
+
+    python joke_engine.py play                          # Enter reveals, Enter again for the next one
+    python joke_engine.py stream --count 1000 > jokes.jsonl   # one JSON object per line
+    python joke_engine.py stream --count 0               # forever (until the pipe closes)
+"""
+import argparse
+import json
+import os
+import sys
+from collections import namedtuple
+
+from joke_scheduler import JokeScheduler
+from joke_store import JokeStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOKES_PATH = os.path.join(BASE_DIR, "..", "..", "A1 - Resources", "randomJokes.txt")
+
+Joke = namedtuple("Joke", "number setup punchline")
+NO_JOKES = Joke(None, "No jokes found!", "Make sure randomJokes.txt is in 'A1 - Resources'.")
+
+
+class JokeEngine:
+    """State of one joke session: which joke is showing and whether its punchline has
+    been revealed. next_joke() and reveal() are the two halves of the big button."""
+
+    def __init__(self, store, scheduler):
+        self.store = store
+        self.scheduler = scheduler
+        self.current_joke = None
+        self.is_setup_shown = False
+        self.told = 0
+        self.schedule_path = None
+
+    @classmethod
+    def open(cls, jokes_path=JOKES_PATH, schedule_path=None, seed=None):
+        """An engine over a joke file. With schedule_path, the place in the joke cycle
+        is loaded from there (and save() writes it back)."""
+        store = None
+        try:
+            store = JokeStore(jokes_path)
+        except OSError as e:
+            print(f"Error loading jokes: {e}", file=sys.stderr)
+        count = len(store) if store else 0
+        if schedule_path:
+            scheduler = JokeScheduler.load(schedule_path, count, seed)
+        else:
+            scheduler = JokeScheduler(count, seed)
+        engine = cls(store, scheduler)
+        engine.schedule_path = schedule_path
+        return engine
+
+    def next_joke(self):
+        """Moves on to the next joke of the cycle. Its setup is shown, the punchline not yet."""
+        if self.store:
+            number = self.scheduler.next()
+            self.current_joke = Joke(number, *self.store[number])
+        else:
+            self.current_joke = NO_JOKES
+        self.is_setup_shown = True
+        self.told += 1
+        return self.current_joke
+
+    def reveal(self):
+        """The current punchline (None before the first joke)."""
+        self.is_setup_shown = False
+        return self.current_joke.punchline if self.current_joke else None
+
+    def save(self):
+        if self.schedule_path:
+            self.scheduler.save(self.schedule_path)
+
+    def close(self):
+        if self.store:
+            self.store.close()
+
+    def stream(self, count, out):
+        """Writes count jokes (0 = no end) to out as JSON lines. Returns how many were written."""
+        written = 0
+        lines = []
+        while not count or written < count:
+            joke = self.next_joke()
+            self.reveal()
+            lines.append(json.dumps({"n": self.told, "joke": joke.number,
+                                     "setup": joke.setup, "punchline": joke.punchline},
+                                    ensure_ascii=False))
+            written += 1
+            if len(lines) == 1000:
+                out.write("\n".join(lines) + "\n")
+                lines.clear()
+        if lines:
+            out.write("\n".join(lines) + "\n")
+        out.flush()
+        return written
+
+
+# ---------- Command Line ----------
+
+def play(engine, args):
+    print("Enter reveals the punchline, Enter again for the next joke, q to quit.")
+    while True:
+        joke = engine.next_joke()
+        if input(f"\n{joke.setup} ").strip().lower() == "q":
+            break
+        print(engine.reveal())
+        if input("").strip().lower() == "q":
+            break
+
+
+def stream(engine, args):
+    try:
+        engine.stream(args.count, sys.stdout)
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head). Point stdout at devnull so
+        # Python's own flush at exit doesn't fail again.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="The Joke Bot without the window")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, func in [("play", play), ("stream", stream)]:
+        command = commands.add_parser(name)
+        command.add_argument("--jokes", default=JOKES_PATH, help="joke file, one 'setup?punchline' per line")
+        command.add_argument("--schedule", help="file to carry the place in the joke cycle across runs")
+        command.add_argument("--seed", type=int)
+        command.set_defaults(func=func)
+    commands.choices["stream"].add_argument("--count", type=int, default=10,
+                                            help="jokes to write (0 = no end)")
+    args = parser.parse_args(argv)
+
+    engine = JokeEngine.open(args.jokes, args.schedule, args.seed)
+    try:
+        args.func(engine, args)
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        engine.save()
+        engine.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Which joke to show next: every joke once per cycle, in a new shuffled order each cycle.
+
+The shuffled order is never stored. Position p of a cycle maps to a slot through a
+keyed Feistel permutation (a small block cipher over 0..slots-1, with cycle-walking
+for sizes that are not a power of two), so a draw is O(1) time and the scheduler is
+O(1) memory however many jokes there are.
+
+Weights (e.g. from ratings) are whole numbers of appearances per cycle: 0 hides a
+joke, 3 shows it three times. Only jokes that are not weight 1 are stored. Changed
+weights apply from the next cycle, so the current one still shows everything once.
+"""
+import json
+import os
+import random
+from bisect import bisect_right
+
+ROUNDS = 4
+MASK64 = 2**64 - 1
+
+
+class JokeScheduler:
+    """next() gives joke numbers (0..count-1) in a non-repeating shuffled order."""
+
+    def __init__(self, count, seed=None, weights=None):
+        self.count = count
+        self.seed = seed if seed is not None else random.randrange(2**63)
+        self.weights = {number: weight for number, weight in (weights or {}).items()
+                        if number < count and weight != 1}
+        self.last = None
+        # Copies of the last joke drawn again straight after it, shown a bit later instead
+        self.held_joke = None
+        self.held = 0
+        self.start_cycle(0)
+
+    # ---------- Cycles ----------
+
+    def start_cycle(self, cycle, position=0):
+        self.cycle = cycle
+        self.position = position
+        self.cycle_weights = dict(self.weights)
+        self.visible = self.count - sum(weight == 0 for weight in self.cycle_weights.values())
+        if self.count and not self.visible:
+            raise ValueError("every joke has weight 0")
+
+        # Slots 0..count-1 are one per joke; extra copies of heavier jokes come after
+        self.extra_jokes = []
+        self.extra_ends = []
+        end = 0
+        for number in sorted(self.cycle_weights):
+            if self.cycle_weights[number] > 1:
+                end += self.cycle_weights[number] - 1
+                self.extra_jokes.append(number)
+                self.extra_ends.append(end)
+        self.slots = self.count + end
+
+        bits = max(2, (self.slots - 1).bit_length())
+        bits += bits % 2
+        self.half_bits = bits // 2
+        self.half_mask = (1 << self.half_bits) - 1
+        rng = random.Random(f"{self.seed}:{cycle}")
+        self.round_keys = [rng.getrandbits(64) for _ in range(ROUNDS)]
+
+    def permute(self, i):
+        """Slot at cycle position i. A bijection on 0..slots-1 chosen by this cycle's keys."""
+        half_bits, half_mask = self.half_bits, self.half_mask
+        while True:
+            left, right = i >> half_bits, i & half_mask
+            for key in self.round_keys:
+                mixed = ((right ^ key) * 0x9E3779B97F4A7C15) & MASK64
+                left, right = right, left ^ ((mixed >> 29) & half_mask)
+            i = (left << half_bits) | right
+            if i < self.slots:  # outside the range: walk on until back inside it
+                return i
+
+    def joke_for_slot(self, slot):
+        if slot < self.count:
+            return None if self.cycle_weights.get(slot) == 0 else slot
+        return self.extra_jokes[bisect_right(self.extra_ends, slot - self.count)]
+
+    def draw(self):
+        while True:
+            if self.position >= self.slots:
+                self.start_cycle(self.cycle + 1)
+            number = self.joke_for_slot(self.permute(self.position))
+            self.position += 1
+            if number is not None:
+                return number
+
+    # ---------- Using It ----------
+
+    def next(self):
+        """Number of the next joke to show."""
+        if not self.count:
+            raise IndexError("no jokes to schedule")
+        if self.held and self.held_joke != self.last:
+            number = self.held_joke
+            self.held -= 1
+        else:
+            number = self.draw()
+            # Never the same joke twice in a row (unless it is the only one)
+            while number == self.last and self.visible > 1:
+                self.held_joke = number
+                self.held = min(self.held + 1, self.slots)
+                number = self.draw()
+        self.last = number
+        return number
+
+    def set_weight(self, number, weight):
+        """How many times per cycle joke number is shown, from the next cycle on."""
+        if weight == 1:
+            self.weights.pop(number, None)
+        else:
+            self.weights[number] = weight
+
+    # ---------- Saving ----------
+
+    def state(self):
+        return {"count": self.count, "seed": self.seed, "cycle": self.cycle,
+                "position": self.position, "last": self.last,
+                "held_joke": self.held_joke, "held": self.held,
+                "weights": sorted(self.weights.items()),
+                "cycle_weights": sorted(self.cycle_weights.items())}
+
+    def save(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.state(), file)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, count, seed=None):
+        """The scheduler saved at path, carrying on where it stopped. A missing or
+        unreadable file, or a different number of jokes, starts a new cycle."""
+        try:
+            with open(path, encoding="utf-8") as file:
+                state = json.load(file)
+            weights = dict(state["weights"])
+            scheduler = cls(count, state["seed"], weights)
+            if state["count"] == count:
+                scheduler.weights = dict(state["cycle_weights"])
+                scheduler.start_cycle(state["cycle"], state["position"])
+                scheduler.weights = weights
+                scheduler.last = state["last"]
+                scheduler.held_joke = state["held_joke"]
+                scheduler.held = state["held"]
+            return scheduler
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Could not load the joke schedule: {e}")
+        return cls(count, seed)
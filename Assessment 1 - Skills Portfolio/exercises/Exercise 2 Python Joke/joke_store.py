@@ -0,0 +1,128 @@
+"""Jokes read straight from a text file, one joke per line.
+
+Each line is a setup and a punchline glued together at the first "?":
+    Why did the chicken cross the road?To get to the other side.
+
+The file is never loaded as a whole. A byte-offset index (where each non-blank
+line starts) is built once and saved next to it as <file>.idx; after that the
+joke file and the index are both opened with mmap and showing a joke reads just
+that one line. Startup time and memory stay the same for 40 jokes or 40 million.
+
+Index layout (little-endian):
+    header   magic "JOKEIDX1", joke file size (uint64), joke file mtime_ns (uint64),
+             joke count (uint64)
+    starts   uint64 x count, byte offset of each joke's line
+
+The index is rebuilt whenever the joke file's size or modification time changes.
+
+    python joke_store.py randomJokes.txt    # builds the index now and prints the count
+"""
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+
+MAGIC = b"JOKEIDX1"
+HEADER = struct.Struct("<8sQQQ")
+
+
+class JokeStore:
+    """store[i] is joke i as (setup, punchline), read from the mapped file when asked for."""
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self.file = None
+        self.mm = None
+        self.index_file = None
+        self.index_mm = None
+        self.starts = array("Q")
+        self.open()
+
+    def open(self):
+        self.file = open(self.path, "rb")
+        info = os.fstat(self.file.fileno())
+        if info.st_size:
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if not self.open_index(info):
+            self.build_index(info)
+
+    def open_index(self, info):
+        """Maps a saved index if it matches the joke file. Returns False if there is none."""
+        try:
+            index_file = open(self.index_path, "rb")
+        except OSError:
+            return False
+        try:
+            header = index_file.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError("truncated")
+            magic, size, mtime_ns, count = HEADER.unpack(header)
+            if (magic, size, mtime_ns) != (MAGIC, info.st_size, info.st_mtime_ns):
+                raise ValueError("stale")
+            if os.fstat(index_file.fileno()).st_size != HEADER.size + 8 * count:
+                raise ValueError("truncated")
+            if count:
+                self.index_mm = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.starts = memoryview(self.index_mm)[HEADER.size:].cast("Q")
+        except (ValueError, OSError):
+            index_file.close()
+            return False
+        self.index_file = index_file
+        return True
+
+    def build_index(self, info):
+        """One pass over the file, then saves the index (kept in memory if it can't be saved)."""
+        starts = array("Q")
+        position = 0
+        self.file.seek(0)
+        for line in self.file:
+            if not line.isspace():
+                starts.append(position)
+            position += len(line)
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as index_file:
+                index_file.write(HEADER.pack(MAGIC, info.st_size, info.st_mtime_ns, len(starts)))
+                starts.tofile(index_file)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"Could not save the joke index: {e}")
+        self.starts = starts
+
+    def close(self):
+        # The memoryview must go before the map it looks at can be closed
+        self.starts = array("Q")
+        for handle in (self.index_mm, self.index_file, self.mm, self.file):
+            if handle is not None:
+                handle.close()
+        self.index_mm = self.index_file = self.mm = self.file = None
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, number):
+        """(setup, punchline) of joke number (0-based)."""
+        start = self.starts[number]
+        end = self.mm.find(b"\n", start)
+        line = self.mm[start:end if end != -1 else len(self.mm)]
+        return split_joke(line.decode("utf-8", errors="replace"))
+
+    def random_joke(self, rng=random):
+        """A random joke, picked by index without reading any other line."""
+        return self[rng.randrange(len(self))]
+
+
+def split_joke(line):
+    """"Setup?Punchline" -> ("Setup?", "Punchline"). A line with no "?" is all setup."""
+    setup, mark, punchline = line.strip().partition("?")
+    return setup + mark, punchline.strip()
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        store = JokeStore(path)
+        print(f"{path}: {len(store):,} jokes, index in {store.index_path}")
+        store.close()
@@ -0,0 +1,87 @@
+import os
+import random
+import time
+
+EFFECT_EXTENSIONS = (".mp3", ".ogg", ".wav")
+
+
+class SoundBank:
+    """Every sound effect in a folder, decoded once into a mixer Sound (raw PCM in the
+    mixer's own format), so playing one never touches the disk or a decoder.
+
+    next() picks the clip for a punchline: "random" (never the same one twice in a
+    row) or "round-robin".
+    """
+
+    def __init__(self, pygame, folder, exclude=(), volume=0.5, pick="random", rng=None):
+        if pick not in ("random", "round-robin"):
+            raise ValueError("pick must be 'random' or 'round-robin'")
+        self.pick = pick
+        self.rng = rng or random.Random()
+        self.names = []
+        self.sounds = []
+        self.last = None
+        exclude = {os.path.basename(path) for path in exclude}
+        for name in sorted(os.listdir(folder)):
+            if not name.lower().endswith(EFFECT_EXTENSIONS) or name in exclude:
+                continue
+            try:
+                sound = pygame.mixer.Sound(os.path.join(folder, name))
+            except Exception as e:
+                print(f"Error loading {name}: {e}")
+                continue
+            sound.set_volume(volume)
+            self.names.append(name)
+            self.sounds.append(sound)
+
+    def __len__(self):
+        return len(self.sounds)
+
+    def next(self):
+        if not self.sounds:
+            return None
+        if self.pick == "round-robin":
+            index = 0 if self.last is None else (self.last + 1) % len(self.sounds)
+        elif len(self.sounds) == 1:
+            index = 0
+        else:
+            index = self.rng.randrange(len(self.sounds) - 1)
+            if self.last is not None and index >= self.last:
+                index += 1  # skips the last one without a retry loop
+        self.last = index
+        return self.sounds[index]
+
+
+class VoicePool:
+    """A fixed set of reserved mixer channels for the effects, so laughs can overlap
+    without ever opening more. A new sound goes to a free channel; when all are busy
+    it steals the one that started longest ago."""
+
+    def __init__(self, pygame, size=4):
+        self.size = size
+        if pygame.mixer.get_num_channels() < size:
+            pygame.mixer.set_num_channels(size)
+        pygame.mixer.set_reserved(size)  # find_channel() and music never use these
+        self.channels = [pygame.mixer.Channel(i) for i in range(size)]
+        self.started_at = [0.0] * size
+        self.stolen = 0
+
+    def play(self, sound):
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                break
+        else:
+            i = min(range(self.size), key=self.started_at.__getitem__)
+            self.stolen += 1
+        self.channels[i].play(sound)
+        self.started_at[i] = time.monotonic()
+        return i
+
+    def fadeout(self, ms):
+        for channel in self.channels:
+            if channel.get_busy():
+                channel.fadeout(ms)
+
+    def stop(self):
+        for channel in self.channels:
+            channel.stop()
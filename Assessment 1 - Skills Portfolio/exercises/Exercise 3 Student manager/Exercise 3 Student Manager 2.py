@@ -1,8 +1,27 @@
 import tkinter as tk
-from tkinter import messagebox, ttk
+from tkinter import filedialog, messagebox, simpledialog, ttk
 import os  # <-- Finding files quickly
+from virtual_table import VirtualTable
+from search_index import SearchIndex
+from loader import StudentLoader
+from journal import StudentJournal, ADD, UPDATE, DELETE, write_snapshot
+from binary_snapshot import is_binary_snapshot, load_snapshot, load_text, write_binary_snapshot
+from student_table import StudentTable, GRADE_LETTERS, MAX_MARKS, calculate_grade, validate_row
 
 class StudentManagerApp:
+    SEARCH_DELAY_MS = 200  # wait for a pause in typing before searching
+    JOURNAL_SYNC_MS = 500  # edits made within this window share one fsync
+    COMPACT_INTERVAL_MS = 60_000  # how often the journal is folded into StudentMarks.txt
+    MIN_TOMBSTONES = 1000  # deleted slots are only squeezed out once there are this many
+
+    # Column heading -> StudentTable field (sorting reads the typed columns, not "87.5%" strings)
+    SORT_FIELDS = {"%": "Percentage"}
+
+    # Statistics panel rows: StudentTable column -> label
+    STAT_LABELS = {"c1": "Coursework 1", "c2": "Coursework 2", "c3": "Coursework 3",
+                   "exam": "Exam", "totals": "Total"}
+    GRADE_COLOURS = {"A": "#d4edda", "F": "#f8d7da"}
+
     def __init__(self, root):
         self.root = root
         self.root.title("Student Manager Pro - Admin Edition")
@@ -14,8 +33,36 @@ class StudentManagerApp:
         self.filename = os.path.join(self.base_dir, "StudentMarks.txt")
         self.logo_path = os.path.join(self.base_dir, "my logo.png")
 
-        # Data storage
-        self.student_data = []
+        # Data storage (columns of typed arrays, rows are addressed by slot number)
+        self.student_data = StudentTable()
+
+        # Edits are appended to a journal, which is folded into the file every so often
+        self.journal = StudentJournal(self.filename)
+        self.sync_job = None
+
+        # Background file loading
+        self.loader = None
+        self.load_complete = False   # edits are blocked until the whole file is in
+        self.previous_data = None    # (table, search index, index stale) to fall back on if a reload is cancelled
+        self.showing_all = True      # new batches only join the view when it shows everyone
+        # What the current view is filtered by (None when it is not)
+        self.view_query = None       # search text, lower case
+        self.view_grade = None       # grade letter
+
+        # Running stats for the rows currently shown (kept up to date by CRUD)
+        self.view_count = 0
+        self.view_total_marks = 0
+
+        # Current sort order: [(column, reverse), ...], most important column first
+        self.sort_spec = []
+
+        # Search
+        self.search_index = SearchIndex()
+        self.search_index_stale = False  # binary snapshots index names on the first search
+        self.search_job = None
+
+        # Statistics panel (None while it is closed)
+        self.stats_window = None
 
         # Setup UI
         self.setup_styles()
@@ -27,6 +74,8 @@ class StudentManagerApp:
 
         # Load Initial Data
         self.load_data()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(self.COMPACT_INTERVAL_MS, self.compaction_tick)
 
     def setup_styles(self):
         style = ttk.Style()
@@ -54,8 +103,9 @@ class StudentManagerApp:
         # --- FILE MENU ---
         file_menu = tk.Menu(menu_bar, tearoff=0)
         file_menu.add_command(label="Reload File", command=self.load_data)
+        file_menu.add_command(label="Cancel Reload", command=self.cancel_loading)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Exit", command=self.on_close)
         menu_bar.add_cascade(label="File", menu=file_menu)
 
         # --- EDIT MENU ---
@@ -63,6 +113,9 @@ class StudentManagerApp:
         edit_menu.add_command(label="Add New Student", command=self.add_student)
         edit_menu.add_command(label="Update Selected Student", command=self.update_student)
         edit_menu.add_command(label="Delete Selected Student", command=self.delete_student)
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Import Students...", command=self.import_students)
+        edit_menu.add_command(label="Delete Students by ID...", command=self.delete_by_ids)
         menu_bar.add_cascade(label="Edit", menu=edit_menu)
 
         # --- VIEW MENU ---
@@ -71,6 +124,8 @@ class StudentManagerApp:
         view_menu.add_separator()
         view_menu.add_command(label="Show A Grades Only", command=self.show_a_grades)
         view_menu.add_command(label="Show F Grades Only", command=self.show_f_grades)
+        view_menu.add_separator()
+        view_menu.add_command(label="Statistics...", command=self.open_stats_window)
         menu_bar.add_cascade(label="View", menu=view_menu)
 
     def create_controls(self):
@@ -97,17 +152,17 @@ class StudentManagerApp:
         tree_frame.pack(fill="both", expand=True, padx=10, pady=5)
 
         cols = ("ID", "Name", "C1", "C2", "C3", "Exam", "Total", "%", "Grade")
+        self.columns = cols
         self.tree = ttk.Treeview(tree_frame, columns=cols, show="headings")
 
-        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical")
         scrollbar.pack(side="right", fill="y")
         self.tree.pack(fill="both", expand=True)
 
         # Define headings and column widths
         widths = [60, 180, 40, 40, 40, 50, 60, 60, 60]
         for col, w in zip(cols, widths):
-            self.tree.heading(col, text=col, command=lambda c=col: self.sort_column(c, False))
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort_column(c))
             self.tree.column(col, width=w, anchor="center")
         
         self.tree.column("Name", anchor="w")
@@ -115,6 +170,12 @@ class StudentManagerApp:
         self.tree.tag_configure("grade_A", background="#d4edda")
         self.tree.tag_configure("grade_F", background="#f8d7da")
 
+        # Shift+click a heading to add it as a secondary sort column
+        self.tree.bind("<Shift-Button-1>", self.on_shift_heading_click)
+
+        # Only the rows on screen exist as Treeview items (keeps big rosters fast)
+        self.table = VirtualTable(self.tree, scrollbar, self.format_row, row_key=self.row_key)
+
     def create_statusbar(self):
         self.status_var = tk.StringVar()
         self.status_var.set("Ready")
@@ -124,104 +185,404 @@ class StudentManagerApp:
     # ---------- Data Logic ----------
 
     def load_data(self):
-        self.student_data = []
+        """Streams the file in on a worker thread. The first rows show up straight away
+        and the rest are added batch by batch while the window stays responsive."""
+        if self.loader and not self.loader.finished:
+            self.loader.cancel()
+        # Forgotten too, so its last "cancelled" callback can't land on the new roster
+        self.loader = None
+        if self.load_complete:
+            self.previous_data = (self.student_data, self.search_index, self.search_index_stale)
+
+        # The snapshot and journal read below have to agree, so finish any running
+        # compaction and get pending edits onto disk first
+        if self.journal.is_compacting():
+            self.journal.compactor.join()
+        self.sync_journal()
+
+        # Binary snapshots are detected by their header and need no parsing
+        if is_binary_snapshot(self.filename):
+            self.load_binary()
+            return
+        self.journal.writer = write_snapshot
+
+        self.student_data = StudentTable()
+        self.search_index = SearchIndex()
+        self.search_index_stale = False
+        self.load_complete = False
+        self.refresh_table()
+        self.status_var.set("Loading...")
+
+        loader = StudentLoader(
+            self.root, self.filename,
+            on_batch=lambda rows, progress: self.on_load_batch(loader, rows, progress),
+            on_done=lambda cancelled: self.on_load_done(loader, cancelled),
+            on_error=lambda error: self.on_load_error(loader, error),
+        )
+        self.loader = loader.start()
+
+    def load_binary(self):
+        """Maps a binary snapshot straight into the table columns. Names are decoded
+        lazily, so indexing them for search waits until the first search."""
         try:
-            with open(self.filename, "r") as file:
-                lines = file.readlines()
-                if not lines: return
-
-                for line in lines[1:]: 
-                    parts = line.strip().split(",")
-                    if len(parts) != 6: continue
-                    try:
-                        s_id = int(parts[0])
-                        name = parts[1].strip()
-                        c1, c2, c3, exam = map(int, parts[2:])
-                        
-                        # Store raw data for editing later
-                        total = c1 + c2 + c3 + exam
-                        percentage = (total / 160) * 100
-                        grade = self.calculate_grade(percentage)
-
-                        self.student_data.append({
-                            "ID": s_id, "Name": name, 
-                            "C1": c1, "C2": c2, "C3": c3, "Exam": exam, 
-                            "Total": total, "Percentage": round(percentage, 2),
-                            "Grade": grade
-                        })
-                    except ValueError: continue 
+            table = load_snapshot(self.filename)
+        except (OSError, ValueError) as e:
+            self.previous_data = None
+            self.load_complete = True
+            messagebox.showerror("Load Error", f"Could not load file: {e}")
+            return
+
+        self.student_data = table
+        self.search_index = SearchIndex()
+        self.search_index_stale = True
+        self.journal.writer = write_binary_snapshot  # compaction keeps the file binary
+        self.drop_previous_data()
+        self.load_complete = True
+        self.replay_journal()
+        self.run_search()
+
+    def ensure_search_index(self):
+        if self.search_index_stale:
+            self.search_index_stale = False
+            t = self.student_data
+            self.search_index.build((t.ids[slot], t.names[slot], slot) for slot in t.slots())
+
+    def cancel_loading(self):
+        if self.loader and not self.loader.finished:
+            self.loader.cancel()
+
+    def on_load_batch(self, loader, rows, progress):
+        if loader is not self.loader: return  # left over from a cancelled load
+
+        t = self.student_data
+        first = len(t.ids)
+        # Totals and grades are worked out for the whole batch in one go
+        t.extend(rows)
+        slots = range(first, len(t.ids))
+        self.search_index.add_many((t.ids[slot], t.names[slot], slot) for slot in slots)
+
+        if self.showing_all:
+            self.table.insert_rows(slots)
+            self.view_count += len(slots)
+            self.view_total_marks += sum(t.totals[first:])
+        self.status_var.set(f"Loading... {progress:.0%} ({len(t):,} students)")
+        self.update_stats_panel()
+
+    def on_load_done(self, loader, cancelled):
+        if loader is not self.loader: return
+
+        if cancelled and self.previous_data:
+            # Reload cancelled: go back to what we had before
+            self.student_data, self.search_index, self.search_index_stale = self.previous_data
+            self.previous_data = None
+            self.load_complete = True
+            self.run_search()
+            self.status_var.set("Reload cancelled. Showing the previously loaded data.")
+            return
 
+        self.drop_previous_data()
+        self.load_complete = not cancelled
+        if not cancelled:
+            self.replay_journal()
+        # Apply the search box and sort order to the full roster
+        self.run_search()
+        if cancelled:
+            self.status_var.set(f"Loading cancelled after {len(self.student_data):,} students. "
+                                "Reload the file before making changes.")
+
+    def on_load_error(self, loader, error):
+        if loader is not self.loader: return
+
+        if self.previous_data:
+            self.student_data, self.search_index, self.search_index_stale = self.previous_data
+            self.previous_data = None
+            self.refresh_table()
+        elif isinstance(error, FileNotFoundError):
+            # No snapshot yet, but there may be journaled edits
+            self.replay_journal()
             self.refresh_table()
-            
-        except FileNotFoundError:
+        self.load_complete = True
+
+        if isinstance(error, FileNotFoundError):
             # Uses the absolute path so the user knows exactly where it was looking
             messagebox.showerror("Error", f"File not found!\nLooking at:\n{self.filename}")
+        else:
+            messagebox.showerror("Load Error", f"Could not load file: {error}")
+
+    def drop_previous_data(self):
+        """Forgets the roster kept for a cancelled reload, letting go of its mapped file."""
+        if self.previous_data:
+            self.previous_data[0].close()
+        self.previous_data = None
+
+    def check_editable(self):
+        """Edits end up folded into the file, so they must wait until all of it has been loaded."""
+        if self.load_complete:
+            return True
+        if self.loader and not self.loader.finished:
+            messagebox.showwarning("Please Wait", "The student file is still loading.")
+        else:
+            messagebox.showwarning("Partial Data", "Only part of the file was loaded.\n"
+                                                   "Reload it before making changes.")
+        return False
+
+    # ---------- Persistence ----------
+
+    def record_change(self, op, value):
+        """Appends one edit to the journal. The fsync follows shortly, once per burst of edits."""
+        try:
+            self.journal.append(op, value)
+        except OSError as e:
+            messagebox.showerror("Save Error", f"Could not save change: {e}")
+            return
+        if self.sync_job is None:
+            self.sync_job = self.root.after(self.JOURNAL_SYNC_MS, self.sync_journal)
 
-    def save_to_file(self):
-        """Writes the current self.student_data list back to the text file."""
+    def sync_journal(self):
+        if self.sync_job:
+            self.root.after_cancel(self.sync_job)
+        self.sync_job = None
         try:
-            with open(self.filename, "w") as file:
-                # First line is the count of students
-                file.write(f"{len(self.student_data)}\n")
-                
-                # Subsequent lines: ID,Name,C1,C2,C3,Exam
-                for s in self.student_data:
-                    line = f"{s['ID']},{s['Name']},{s['C1']},{s['C2']},{s['C3']},{s['Exam']}\n"
-                    file.write(line)
-            # Log success (optional)
-            self.status_var.set("File saved successfully.")
-        except Exception as e:
-            messagebox.showerror("Save Error", f"Could not save file: {e}")
+            self.journal.sync()
+        except OSError as e:
+            messagebox.showerror("Save Error", f"Could not save changes: {e}")
+
+    def replay_journal(self):
+        """Applies the edits journaled since StudentMarks.txt was last written.
+        The view is left alone, callers redraw it once afterwards."""
+        data = self.student_data
+        for op, value in self.journal.replay():
+            if op == DELETE:
+                slot = data.find(value)
+                if slot is not None:
+                    self.apply_delete(slot, redraw=False)
+                continue
+            slot = data.find(value[0])
+            if slot is None:
+                self.apply_add(value, redraw=False)
+            else:
+                self.apply_update(slot, value, redraw=False)
+        self.compact_tombstones()
+
+    def compaction_tick(self):
+        """Folds the journal into a fresh StudentMarks.txt on a background thread."""
+        if self.journal.compaction_error:
+            print(f"Could not compact the journal, will retry: {self.journal.compaction_error}")
+            self.journal.compaction_error = None
+
+        if self.load_complete and self.journal.needs_compaction() and not self.journal.is_compacting():
+            self.sync_journal()
+            # copy() also copies the names out of a mapped binary snapshot, which
+            # compaction is about to replace
+            self.journal.compact(self.student_data.copy())
+        self.root.after(self.COMPACT_INTERVAL_MS, self.compaction_tick)
+
+    def on_close(self):
+        # Everything journaled is on disk after this; the next start replays it
+        self.cancel_loading()
+        self.sync_journal()
+        self.journal.close()
+        self.student_data.close()
+        self.root.destroy()
 
     def calculate_grade(self, percentage):
-        if percentage >= 70: return "A"
-        if percentage >= 60: return "B"
-        if percentage >= 50: return "C"
-        if percentage >= 40: return "D"
-        return "F"
+        return calculate_grade(percentage)
 
     # ---------- CRUD FEATURES (Add, Update, Delete) ----------
 
     def add_student(self):
         """Popup window to add a new student"""
+        if not self.check_editable(): return
         self.open_edit_window(title="Add Student")
 
     def update_student(self):
         """Popup window to edit selected student"""
-        selected = self.tree.selection()
-        if not selected:
+        if not self.check_editable(): return
+        if self.table.selected_row() is None:
             messagebox.showwarning("Select Student", "Please select a student to update.")
             return
 
-        # Get the ID of the selected row
-        item_values = self.tree.item(selected[0], "values")
-        selected_id = int(item_values[0])
-
-        # Find the full student object
-        student_obj = next((s for s in self.student_data if s["ID"] == selected_id), None)
-        
-        if student_obj:
-            self.open_edit_window(title="Update Student", student=student_obj)
+        # The selected row is the student's slot, so no lookup is needed
+        slot = self.table.selected_row()
+        self.open_edit_window(title="Update Student", student=self.student_data.record(slot))
 
     def delete_student(self):
         """Deletes selected student and saves file"""
-        selected = self.tree.selection()
-        if not selected:
+        if not self.check_editable(): return
+        selected = self.table.selected_row()
+        if selected is None:
             messagebox.showwarning("Select Student", "Please select a student to delete.")
             return
 
-        item_values = self.tree.item(selected[0], "values")
-        selected_id = int(item_values[0])
-        student_name = item_values[1]
+        selected_id = self.row_key(selected)
+        student_name = self.student_data.names[selected]
 
         confirm = messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {student_name}?")
         if confirm:
-            # Remove from list
-            self.student_data = [s for s in self.student_data if s["ID"] != selected_id]
-            self.save_to_file()
-            self.refresh_table()
+            self.apply_delete(selected)
+            self.record_change(DELETE, selected_id)
+            if self.compact_tombstones():
+                self.refresh_view()
+            self.update_status()
             messagebox.showinfo("Deleted", f"Student {student_name} deleted.")
 
+    # Each apply_* changes the data, search index and table view for one student.
+    # They are shared by the edit window, journal replay and bulk operations.
+    # With redraw=False the view is not touched; the caller redraws it once at the end.
+
+    def apply_add(self, row, redraw=True):
+        slot = self.student_data.append(*row)
+        self.search_index.add(row[0], row[1], slot)
+        if redraw and self.view_matches(slot):
+            if self.sort_spec:
+                # Its place depends on the sort order, let the view sort it in
+                self.refresh_view()
+                return slot
+            # New slots come last in roster order, so it goes at the end of the view
+            self.table.insert_row(slot)
+            self.view_count += 1
+            self.view_total_marks += self.student_data.totals[slot]
+        return slot
+
+    def apply_update(self, slot, row, redraw=True):
+        data = self.student_data
+        old_total = data.totals[slot]
+        sort_keys = [key for key, _ in self.sort_keys()]
+        old_order = [key(slot) for key in sort_keys]
+        # Totals and grade are recalculated by the table
+        data.update(slot, *row[1:])
+        self.search_index.update(row[0], row[1], slot)
+        if not redraw:
+            return
+
+        shown = self.table.index_of(row[0]) is not None
+        matches = self.view_matches(slot)
+        if shown and matches:
+            if [key(slot) for key in sort_keys] != old_order:
+                self.refresh_view()  # it moves to another place in the sort order
+                return
+            # Patch only that row
+            self.table.update_row(slot)
+            self.view_total_marks += data.totals[slot] - old_total
+        elif shown:
+            # No longer matches the search or grade filter
+            self.table.delete_row(row[0])
+            self.view_count -= 1
+            self.view_total_marks -= old_total
+        elif matches:
+            self.refresh_view()  # now matches; it joins the view at its place
+
+    def apply_delete(self, slot, redraw=True):
+        s_id = self.student_data.ids[slot]
+        if redraw:
+            # Remove just that one row from the table
+            if self.table.delete_row(s_id) is not None:
+                self.view_count -= 1
+                self.view_total_marks -= self.student_data.totals[slot]
+        elif self.table.selected == slot:
+            self.table.selected = None
+
+        # Remove from the data (leaves a tombstone, other slots keep their numbers)
+        self.student_data.delete(slot)
+        self.search_index.remove(s_id)
+
+    def compact_tombstones(self):
+        """Drops deleted slots once they outnumber the live students. Slots change,
+        so the search index is rebuilt on the next search and the caller redraws."""
+        data = self.student_data
+        if data.dead_count() <= max(self.MIN_TOMBSTONES, len(data)):
+            return False
+        self.student_data = data.compacted()
+        data.close()
+        self.search_index = SearchIndex()
+        self.search_index_stale = True
+        self.table.selected = None
+        return True
+
+    # ---------- Bulk Operations ----------
+
+    def apply_bulk(self, rows=(), delete_ids=()):
+        """Adds or updates (when the ID exists) many students and deletes many IDs.
+
+        Everything goes through the same ID index as single edits, but the journal is
+        synced once and the view is redrawn once for the whole batch.
+        Returns (added, updated, deleted).
+        """
+        data = self.student_data
+        new_rows = {}   # ID -> row, a later row for the same new ID wins
+        records = []
+        updated = deleted = 0
+
+        for row in rows:
+            slot = data.find(row[0])
+            if slot is None:
+                new_rows[row[0]] = row
+            else:
+                self.apply_update(slot, row, redraw=False)
+                records.append((UPDATE, row))
+                updated += 1
+
+        if new_rows:
+            first = len(data.ids)
+            data.extend(new_rows.values())
+            self.search_index.add_many((row[0], row[1], slot)
+                                       for slot, row in enumerate(new_rows.values(), first))
+            records.extend((ADD, row) for row in new_rows.values())
+
+        for s_id in delete_ids:
+            slot = data.find(s_id)
+            if slot is not None:
+                self.apply_delete(slot, redraw=False)
+                records.append((DELETE, s_id))
+                deleted += 1
+
+        try:
+            for op, value in records:
+                self.journal.append(op, value)
+        except OSError as e:
+            messagebox.showerror("Save Error", f"Could not save changes: {e}")
+        self.sync_journal()  # one fsync for the whole batch
+
+        self.compact_tombstones()
+        self.refresh_view()  # one redraw, keeping the search or grade filter
+        return len(new_rows), updated, deleted
+
+    def import_students(self):
+        """Adds or updates every student in another marks file (text or binary)."""
+        if not self.check_editable(): return
+        path = filedialog.askopenfilename(
+            title="Import Students",
+            filetypes=[("Marks files", "*.txt *.bin"), ("All files", "*.*")])
+        if not path: return
+
+        try:
+            imported = load_snapshot(path) if is_binary_snapshot(path) else load_text(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Import Error", f"Could not read file: {e}")
+            return
+
+        rows = [imported.row(slot) for slot in imported.slots()]
+        imported.close()
+        added, updated, _ = self.apply_bulk(rows=rows)
+        messagebox.showinfo("Import Complete", f"{added} students added, {updated} updated.")
+
+    def delete_by_ids(self):
+        """Deletes every student whose ID is listed (separated by commas or spaces)."""
+        if not self.check_editable(): return
+        text = simpledialog.askstring("Delete Students", "Student IDs to delete:", parent=self.root)
+        if not text: return
+
+        try:
+            ids = [int(part) for part in text.replace(",", " ").split()]
+        except ValueError:
+            messagebox.showerror("Input Error", "Student IDs must be whole numbers.")
+            return
+
+        if not messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {len(ids)} students?"):
+            return
+        _, _, deleted = self.apply_bulk(delete_ids=ids)
+        messagebox.showinfo("Deleted", f"{deleted} students deleted.")
+
     def open_edit_window(self, title, student=None):
         """Generic window for Adding OR Updating a student"""
         win = tk.Toplevel(self.root)
@@ -262,38 +623,25 @@ class StudentManagerApp:
                 c3 = int(entries["Coursework 3 (20)"].get())
                 exam = int(entries["Exam (100)"].get())
 
-                if not name: raise ValueError("Name cannot be empty")
-                if any(x < 0 for x in [c1, c2, c3, exam]): raise ValueError("Marks cannot be negative")
-
-                # Calculations
-                total = c1 + c2 + c3 + exam
-                percentage = (total / 160) * 100
-                grade = self.calculate_grade(percentage)
-
-                new_record = {
-                    "ID": s_id, "Name": name, 
-                    "C1": c1, "C2": c2, "C3": c3, "Exam": exam, 
-                    "Total": total, "Percentage": round(percentage, 2),
-                    "Grade": grade
-                }
+                row = (s_id, name, c1, c2, c3, exam)
+                validate_row(*row)
 
                 if student:
                     # UPDATE EXISTING
-                    # Find index and replace
-                    idx = next(i for i, s in enumerate(self.student_data) if s["ID"] == s_id)
-                    self.student_data[idx] = new_record
+                    self.apply_update(self.student_data.find(s_id), row)
+                    self.record_change(UPDATE, row)
                     action_type = "Updated"
                 else:
                     # ADD NEW (Check ID unique)
-                    if any(s["ID"] == s_id for s in self.student_data):
+                    if self.student_data.find(s_id) is not None:
                         messagebox.showerror("Error", "Student ID already exists!")
                         return
-                    self.student_data.append(new_record)
+                    self.apply_add(row)
+                    self.record_change(ADD, row)
                     action_type = "Added"
 
                 # Save and Close
-                self.save_to_file()
-                self.refresh_table()
+                self.update_status()
                 win.destroy()
                 messagebox.showinfo("Success", f"Student {action_type} Successfully.")
 
@@ -304,58 +652,200 @@ class StudentManagerApp:
 
     # ---------- View Logic ----------
 
-    def refresh_table(self, data=None):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
+    def row_key(self, slot):
+        return self.student_data.ids[slot]
+
+    def format_row(self, slot):
+        """Turns a student (table slot) into Treeview values + tags."""
+        t = self.student_data
+        grade = t.grade(slot)
+        tag = "normal"
+        if grade == "A": tag = "grade_A"
+        elif grade == "F": tag = "grade_F"
+
+        values = (
+            t.ids[slot], t.names[slot], t.c1[slot], t.c2[slot], t.c3[slot], t.exam[slot],
+            t.totals[slot], f"{t.percentage(slot)}%", grade
+        )
+        return values, (tag,)
+
+    def refresh_table(self, data=None, total_marks=None):
+        """Shows a list of slots (all students when data is None).
+        total_marks is their summed Total if the caller already knows it."""
+        self.showing_all = data is None
+        self.view_query = self.view_grade = None
         if data is None:
-            data = self.student_data
-
-        total_percent = 0
-        for s in data:
-            tag = "normal"
-            if s["Grade"] == "A": tag = "grade_A"
-            elif s["Grade"] == "F": tag = "grade_F"
-            
-            self.tree.insert("", tk.END, values=(
-                s["ID"], s["Name"], s["C1"], s["C2"], s["C3"], s["Exam"], 
-                s["Total"], f"{s['Percentage']}%", s["Grade"]
-            ), tags=(tag,))
-            total_percent += s["Percentage"]
-
-        count = len(data)
-        avg = (total_percent / count) if count > 0 else 0
+            data = self.student_data.slots()
+            total_marks = self.student_data.total_marks()
+
+        # Only the visible window gets painted. Showing everyone unsorted hands the slot
+        # range over as it is and the Total sum is kept running, so that redraw does not
+        # grow with the roster. A sort (O(n log n)) or deleted slots waiting to be
+        # compacted (O(n) to skip) still cost per row. The current sort order is kept
+        # when the view changes (search, grade filters...).
+        self.table.set_rows(data, self.sort_keys())
+
+        self.view_count = len(data)
+        if total_marks is None:
+            total_marks = sum(map(self.student_data.totals.__getitem__, data))
+        self.view_total_marks = total_marks
+        self.update_status()
+
+    def update_status(self):
+        count = self.view_count
+        avg = (self.view_total_marks / count / MAX_MARKS * 100) if count > 0 else 0
         self.status_var.set(f"Records Shown: {count} | Average: {avg:.2f}%")
+        self.update_stats_panel()
+
+    def view_matches(self, slot):
+        """Whether a student belongs in the current view (search results or grade filter)."""
+        t = self.student_data
+        if self.view_grade is not None:
+            return t.grade(slot) == self.view_grade
+        if self.view_query is not None:
+            return self.view_query in SearchIndex.make_key(t.ids[slot], t.names[slot])
+        return True
+
+    def refresh_view(self):
+        """Rebuilds the current view (grade filter or search) from the data."""
+        if self.view_grade is not None:
+            self.show_grade(self.view_grade)
+        else:
+            self.run_search()
 
     def filter_data(self, event=None):
-        query = self.search_var.get().lower().strip()
-        if not query:
+        # Debounce: a burst of key presses only runs one search
+        if self.search_job:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(self.SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self):
+        self.search_job = None
+        if self.search_var.get().strip():
+            self.ensure_search_index()
+        results = self.search_index.search(self.search_var.get())
+        if results is None:
             self.refresh_table()
             return
-        filtered = [s for s in self.student_data if query in s["Name"].lower() or query in str(s["ID"])]
-        self.refresh_table(filtered)
+        self.refresh_table(results)
+        self.view_query = self.search_var.get().lower().strip()
 
     def clear_filter(self):
+        if self.search_job:
+            self.root.after_cancel(self.search_job)
+            self.search_job = None
         self.search_var.set("")
         self.refresh_table()
 
-    def show_a_grades(self):
+    def show_grade(self, letter):
+        """Shows one grade straight from the grade buckets (no roster scan)."""
         if not self.student_data: return
-        self.refresh_table([s for s in self.student_data if s["Grade"] == "A"])
+        stats = self.student_data.aggregates()
+        code = GRADE_LETTERS.index(letter)
+        self.refresh_table(stats.grade_slots(code), total_marks=stats.grade_totals[code])
+        self.view_grade = letter
+
+    def show_a_grades(self):
+        self.show_grade("A")
 
     def show_f_grades(self):
-        if not self.student_data: return
-        self.refresh_table([s for s in self.student_data if s["Grade"] == "F"])
+        self.show_grade("F")
 
-    def sort_column(self, col, reverse):
-        l = [(self.tree.set(k, col), k) for k in self.tree.get_children('')]
-        try:
-            l.sort(key=lambda t: float(t[0].strip('%')), reverse=reverse)
-        except ValueError:
-            l.sort(key=lambda t: t[0], reverse=reverse)
-        for index, (val, k) in enumerate(l):
-            self.tree.move(k, '', index)
-        self.tree.heading(col, command=lambda: self.sort_column(col, not reverse))
+    def sort_keys(self):
+        t = self.student_data
+        return [(t.sort_key(self.SORT_FIELDS.get(col, col)), reverse) for col, reverse in self.sort_spec]
+
+    def sort_column(self, col, add=False):
+        """Click: sort by col (click again to flip). Shift+click: add col as a tie-breaker."""
+        current = dict(self.sort_spec)
+        reverse = not current[col] if col in current else False
+
+        if add:
+            self.sort_spec = [(c, r) for c, r in self.sort_spec if c != col] + [(col, reverse)]
+        else:
+            self.sort_spec = [(col, reverse)]
+
+        # Sort the records behind the table and push the new order in one repaint
+        self.table.sort_rows(self.sort_keys())
+        self.update_headings()
+
+    def on_shift_heading_click(self, event):
+        if self.tree.identify_region(event.x, event.y) != "heading":
+            return
+        col_index = int(self.tree.identify_column(event.x).lstrip("#")) - 1
+        self.sort_column(self.columns[col_index], add=True)
+        return "break"
+
+    def update_headings(self):
+        """Shows the sort direction (and priority when sorting by several columns)."""
+        for col in self.columns:
+            self.tree.heading(col, text=col)
+        for priority, (col, reverse) in enumerate(self.sort_spec, start=1):
+            arrow = "▼" if reverse else "▲"
+            label = f"{col} {arrow}" if len(self.sort_spec) == 1 else f"{col} {arrow}{priority}"
+            self.tree.heading(col, text=label)
+
+    # ---------- Statistics Panel ----------
+
+    def open_stats_window(self):
+        """Grade histogram and per-component figures for the whole roster.
+        They come from the running aggregates, so the panel stays live while editing."""
+        if self.stats_window is not None:
+            self.stats_window.lift()
+            return
+
+        win = self.stats_window = tk.Toplevel(self.root)
+        win.title("Statistics")
+        win.geometry("420x400")
+        win.protocol("WM_DELETE_WINDOW", self.close_stats_window)
+
+        self.stats_canvas = tk.Canvas(win, width=400, height=190, bg="white")
+        self.stats_canvas.pack(padx=10, pady=10)
+
+        grid = tk.Frame(win)
+        grid.pack(padx=10, pady=5)
+        for col, text in enumerate(("", "Average", "Min", "Max", "Median")):
+            tk.Label(grid, text=text, font=("Arial", 10, "bold")).grid(row=0, column=col, padx=8)
+
+        self.stats_cells = {}
+        for row, (column, label) in enumerate(self.STAT_LABELS.items(), start=1):
+            tk.Label(grid, text=label).grid(row=row, column=0, sticky="w")
+            cells = []
+            for col in range(1, 5):
+                var = tk.StringVar()
+                tk.Label(grid, textvariable=var).grid(row=row, column=col, padx=8)
+                cells.append(var)
+            self.stats_cells[column] = cells
+
+        self.update_stats_panel()
+
+    def close_stats_window(self):
+        self.stats_window.destroy()
+        self.stats_window = None
+
+    def update_stats_panel(self):
+        if self.stats_window is None: return
+        stats = self.student_data.aggregates()
+
+        # Grade histogram
+        canvas = self.stats_canvas
+        canvas.delete("all")
+        counts = [stats.grade_count(code) for code in range(len(GRADE_LETTERS))]
+        tallest = max(counts) or 1
+        for i, (letter, count) in enumerate(zip(GRADE_LETTERS, counts)):
+            x = 25 + i * 75
+            height = count / tallest * 130
+            canvas.create_rectangle(x, 160 - height, x + 55, 160,
+                                    fill=self.GRADE_COLOURS.get(letter, "#d0e1f9"))
+            canvas.create_text(x + 27, 150 - height, text=f"{count:,}")
+            canvas.create_text(x + 27, 175, text=letter, font=("Arial", 10, "bold"))
+
+        # Per-component figures
+        for column, cells in self.stats_cells.items():
+            marks = stats.column(column)
+            values = (f"{marks.mean():.1f}", marks.minimum(), marks.maximum(), f"{marks.median():g}")
+            for var, value in zip(cells, values):
+                var.set(value)
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,333 @@
+"""Performance checks for the Student Manager.
+
+Run from this folder:  python benchmarks.py
+The table benchmarks need a display (they build a real Tk window).
+"""
+import importlib.util
+import os
+import random
+import tempfile
+import time
+import tkinter as tk
+import tracemalloc
+
+from student_table import StudentTable
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(BASE_DIR, "Exercise 3 Student Manager 2.py")
+
+FIRST_NAMES = ["John", "Sam", "Lee", "Matt", "Jake", "Amy", "Priya", "Omar", "Sofia", "Chen",
+               "Fatima", "Lucas", "Hannah", "Mohammed", "Grace", "Ivan", "Zara", "Noah"]
+LAST_NAMES = ["Curry", "Sturtivant", "Scott", "Thompson", "Hobbs", "Patel", "Khan", "Garcia",
+              "Nguyen", "Smith", "Okafor", "Rossi", "Murphy", "Kowalski", "Haddad", "Jensen"]
+
+
+def load_app_module():
+    """Imports the app script (its file name has spaces, so no plain import)."""
+    spec = importlib.util.spec_from_file_location("student_manager", APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_students(n, seed=1):
+    """Builds n random student records as dicts (the shape the old load_data produced)."""
+    rng = random.Random(seed)
+    students = []
+    for i in range(n):
+        c1, c2, c3 = rng.randint(0, 20), rng.randint(0, 20), rng.randint(0, 20)
+        exam = rng.randint(0, 100)
+        total = c1 + c2 + c3 + exam
+        percentage = (total / 160) * 100
+        grade = "A" if percentage >= 70 else "B" if percentage >= 60 else \
+                "C" if percentage >= 50 else "D" if percentage >= 40 else "F"
+        students.append({
+            "ID": 1000 + i, "Name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}{i}",
+            "C1": c1, "C2": c2, "C3": c3, "Exam": exam,
+            "Total": total, "Percentage": round(percentage, 2),
+            "Grade": grade
+        })
+    return students
+
+
+def make_table(n, seed=1):
+    """The same students loaded into a StudentTable."""
+    table = StudentTable()
+    table.extend((s["ID"], s["Name"], s["C1"], s["C2"], s["C3"], s["Exam"])
+                 for s in make_students(n, seed))
+    return table
+
+
+def timed(func, repeat=3):
+    """Best-of-N wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def legacy_refresh(tree, data):
+    """The old refresh_table: delete every item then insert one per student."""
+    for item in tree.get_children():
+        tree.delete(item)
+    for s in data:
+        tree.insert("", tk.END, values=(
+            s["ID"], s["Name"], s["C1"], s["C2"], s["C3"], s["Exam"],
+            s["Total"], f"{s['Percentage']}%", s["Grade"]
+        ))
+
+
+# ---------- Benchmarks ----------
+
+def bench_refresh(sizes=(1_000, 10_000, 100_000), legacy_limit=10_000):
+    """Redraw time of refresh_table vs roster size (should stay flat)."""
+    module = load_app_module()
+    root = tk.Tk()
+    app = module.StudentManagerApp(root)
+    root.update()
+
+    print("refresh_table redraw time")
+    for n in sizes:
+        app.student_data = make_table(n)
+        virtual_ms = timed(lambda: (app.refresh_table(), root.update_idletasks()))
+        line = f"  {n:>9,} rows | virtual: {virtual_ms:8.2f} ms"
+
+        if n <= legacy_limit:  # the old path takes minutes on the big sizes
+            students = make_students(n)
+            legacy_ms = timed(lambda: (legacy_refresh(app.tree, students),
+                                       root.update_idletasks()), repeat=1)
+            line += f" | full rebuild: {legacy_ms:8.2f} ms"
+            legacy_refresh(app.tree, [])
+            app.table.items = []
+        print(line)
+
+    root.destroy()
+
+
+def bench_single_edit(sizes=(1_000, 10_000, 100_000, 1_000_000), cycles=200):
+    """Cost of one add/update/delete through the row-level path vs a full refresh.
+
+    The first edit after a refresh builds the table's key -> row map, so it is
+    timed on its own; the cycles after it delete from the middle of the rows.
+    """
+    module = load_app_module()
+    root = tk.Tk()
+    app = module.StudentManagerApp(root)
+    root.update()
+
+    print("single record edit")
+    for n in sizes:
+        data = app.student_data = make_table(n)
+        app.refresh_table()
+        root.update_idletasks()
+        start = time.perf_counter()
+        app.table.update_row(n // 2)
+        first_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for i in range(cycles):
+            slot = data.append(10_000_000 + i, "New Student", 10, 10, 10, 50)
+            app.table.insert_row(slot)
+            data.update(n // 4 + i, data.names[n // 4 + i], 0, 0, 0, 0)
+            app.table.update_row(n // 4 + i)
+            app.table.delete_row(data.ids[n // 2 + i])
+            data.delete(n // 2 + i)
+            root.update_idletasks()
+        row_ms = (time.perf_counter() - start) / cycles * 1000
+
+        full_ms = timed(lambda: (app.refresh_table(), root.update_idletasks()))
+        print(f"  {n:>9,} rows | row-level: {row_ms:8.3f} ms | first edit after a refresh: "
+              f"{first_ms:8.2f} ms | full refresh: {full_ms:8.2f} ms")
+
+    root.destroy()
+
+
+def bench_search(n=500_000, query="omar khan4"):
+    """Per-keystroke search time while typing a 10-character query."""
+    from search_index import SearchIndex
+
+    students = make_students(n)
+    index = SearchIndex()
+    start = time.perf_counter()
+    index.build((s["ID"], s["Name"], slot) for slot, s in enumerate(students))
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"search over {n:,} students (index build: {build_ms:.0f} ms)")
+
+    for i in range(1, len(query) + 1):
+        typed = query[:i]
+        start = time.perf_counter()
+        results = index.search(typed)
+        indexed_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        q = typed.lower().strip()
+        [s for s in students if q in s["Name"].lower() or q in str(s["ID"])]  # the old scan
+        scan_ms = (time.perf_counter() - start) * 1000
+        print(f"  {typed!r:>14} -> {len(results):>7,} hits | indexed: {indexed_ms:7.2f} ms"
+              f" | linear scan: {scan_ms:7.2f} ms")
+
+    # A fresh query (no previous results to narrow) goes through the n-grams
+    index.forget_last_query()
+    fresh_ms = timed(lambda: (index.forget_last_query(), index.search(query)))
+    print(f"  fresh {query!r}: {fresh_ms:.2f} ms")
+
+
+def bench_sort(sizes=(10_000, 100_000, 1_000_000)):
+    """Data-model sort: one column, and Grade then Percentage (descending)."""
+    from virtual_table import sort_in_place
+
+    print("sorting the student records")
+    for n in sizes:
+        table = make_table(n)
+        slots = table.slots()
+        by_total = [(table.sort_key("Total"), False)]
+        by_grade_then_pct = [(table.sort_key("Grade"), False), (table.sort_key("Percentage"), True)]
+
+        single_ms = timed(lambda: sort_in_place(list(slots), by_total))
+        multi_ms = timed(lambda: sort_in_place(list(slots), by_grade_then_pct))
+        print(f"  {n:>9,} rows | Total: {single_ms:8.1f} ms | Grade, Percentage: {multi_ms:8.1f} ms")
+
+
+def bench_memory(n=1_000_000):
+    """Memory held by n students: list of dicts vs StudentTable."""
+    tracemalloc.start()
+    students = make_students(n)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    rows = [(s["ID"], s["Name"], s["C1"], s["C2"], s["C3"], s["Exam"]) for s in students]
+    del students
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    table = StudentTable()
+    table.extend(rows)
+    del rows
+    table_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"memory for {n:,} students")
+    print(f"  list of dicts: {dict_bytes / 2**20:8.1f} MiB")
+    print(f"  StudentTable:  {table_bytes / 2**20:8.1f} MiB  ({dict_bytes / table_bytes:.1f}x smaller)")
+
+
+def bench_cold_start(n=1_000_000):
+    """Time to get the roster into a StudentTable: text parse vs binary snapshot."""
+    from binary_snapshot import load_snapshot, load_text, write_binary_snapshot
+    from journal import write_snapshot
+
+    with tempfile.TemporaryDirectory() as folder:
+        text_path = os.path.join(folder, "StudentMarks.txt")
+        binary_path = os.path.join(folder, "StudentMarks.bin")
+        table = make_table(n)
+        write_snapshot(text_path, table)
+        write_binary_snapshot(binary_path, table)
+        del table
+
+        def open_binary():
+            table = load_snapshot(binary_path)
+            return [table.names[slot] for slot in range(25)]  # first screenful of names
+
+        text_ms = timed(lambda: load_text(text_path), repeat=1)
+        binary_ms = timed(open_binary)
+
+        print(f"cold start with {n:,} students")
+        print(f"  text file:       {text_ms:9.1f} ms  ({os.path.getsize(text_path) / 2**20:.1f} MiB)")
+        print(f"  binary snapshot: {binary_ms:9.1f} ms  ({os.path.getsize(binary_path) / 2**20:.1f} MiB)")
+
+
+def bench_id_lookup(sizes=(10_000, 100_000, 1_000_000), lookups=1_000):
+    """Finding a student by ID: the ID index vs scanning the ID column."""
+    print("find by ID")
+    for n in sizes:
+        table = make_table(n)
+        rng = random.Random(2)
+        wanted = [table.ids[rng.randrange(n)] for _ in range(lookups)]
+        table.find(wanted[0])  # builds the index once
+
+        index_ms = timed(lambda: [table.find(s_id) for s_id in wanted])
+        scan_ms = timed(lambda: [table.ids.index(s_id) for s_id in wanted], repeat=1)
+        print(f"  {n:>9,} rows | index: {index_ms / lookups * 1000:8.2f} us/lookup"
+              f" | scan: {scan_ms / lookups * 1000:10.2f} us/lookup")
+
+
+def bench_bulk(n=100_000, batch=10_000):
+    """Deleting then re-importing a batch of students: one edit at a time vs apply_bulk."""
+    from journal import StudentJournal
+
+    module = load_app_module()
+    root = tk.Tk()
+    app = module.StudentManagerApp(root)
+    root.update()
+
+    with tempfile.TemporaryDirectory() as folder:
+        app.journal = StudentJournal(os.path.join(folder, "StudentMarks.txt"))
+        print(f"bulk edits of {batch:,} students in a {n:,} roster")
+
+        def reset():
+            app.student_data = make_table(n)
+            app.search_index.build((s_id, name, slot) for slot, (s_id, name)
+                                   in enumerate(zip(app.student_data.ids, app.student_data.names)))
+            app.refresh_table()
+            return [app.student_data.row(slot) for slot in range(0, n, n // batch)]
+
+        rows = reset()
+        start = time.perf_counter()
+        for row in rows:
+            app.apply_delete(app.student_data.find(row[0]))
+            app.record_change(module.DELETE, row[0])
+            app.sync_journal()
+        for row in rows:
+            app.apply_add(row)
+            app.record_change(module.ADD, row)
+            app.sync_journal()
+        root.update_idletasks()
+        single_ms = (time.perf_counter() - start) * 1000
+
+        rows = reset()
+        start = time.perf_counter()
+        app.apply_bulk(delete_ids=[row[0] for row in rows])
+        app.apply_bulk(rows=rows)
+        root.update_idletasks()
+        bulk_ms = (time.perf_counter() - start) * 1000
+
+        print(f"  one at a time: {single_ms:9.1f} ms | apply_bulk: {bulk_ms:9.1f} ms")
+        app.journal.close()
+
+    root.destroy()
+
+
+def bench_aggregates(n=1_000_000):
+    """Grade filter + status average: rescanning the roster vs the running aggregates."""
+    from itertools import compress, repeat
+    from operator import eq
+
+    table = make_table(n)
+    start = time.perf_counter()
+    stats = table.aggregates()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    def rescan():
+        # What show_a_grades and refresh_table used to do
+        matches = compress(range(len(table.ids)), map(eq, table.grades, repeat(0)))
+        slots = [slot for slot in matches if table.alive[slot]]
+        return slots, sum(map(table.totals.__getitem__, slots))
+
+    scan_ms = timed(rescan)
+    bucket_ms = timed(lambda: (stats.grade_slots(0), stats.grade_totals[0]))
+    edit_ms = timed(lambda: table.update(n // 2, "Edited", 20, 20, 20, 100)) * 1000
+    print(f"aggregates over {n:,} students (first build: {build_ms:.0f} ms)")
+    print(f"  A grades + average | rescan: {scan_ms:8.1f} ms | buckets: {bucket_ms:8.1f} ms")
+    print(f"  one update incl. aggregates: {edit_ms:.1f} us")
+
+
+if __name__ == "__main__":
+    bench_refresh()
+    bench_single_edit()
+    bench_search()
+    bench_sort()
+    bench_memory()
+    bench_cold_start()
+    bench_id_lookup()
+    bench_bulk()
+    bench_aggregates()
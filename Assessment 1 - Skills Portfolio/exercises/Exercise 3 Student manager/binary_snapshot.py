@@ -0,0 +1,205 @@
+"""Binary snapshot format for student marks, opened with mmap for a fast cold start.
+
+Layout (little-endian):
+    header        magic "SMARKS01", student count (uint32), names size (uint32)
+    ids           int32  x count
+    c1, c2, c3    uint16 x count each
+    exam          uint16 x count
+    totals        uint32 x count
+    grades        uint8  x count   (index into GRADE_LETTERS)
+    name offsets  uint32 x (count + 1)
+    names         UTF-8 string table, name i is names[offsets[i]:offsets[i + 1]]
+
+Every numeric column is a fixed-width array, so loading is a straight copy into the
+StudentTable arrays with no text parsing. Names stay in the mapped file and are only
+decoded when something asks for them (e.g. the rows on screen).
+
+Convert from/to the comma-separated text format with:
+    python binary_snapshot.py to-binary StudentMarks.txt StudentMarks.bin
+    python binary_snapshot.py to-text StudentMarks.bin StudentMarks.txt
+"""
+import mmap
+import struct
+import sys
+from array import array
+from itertools import accumulate, compress
+
+from journal import atomic_write, write_snapshot
+from loader import parse_rows, read_chunks, split_lines
+from student_table import StudentTable
+
+MAGIC = b"SMARKS01"
+HEADER = struct.Struct("<8sII")
+COLUMNS = [("ids", "i"), ("c1", "H"), ("c2", "H"), ("c3", "H"), ("exam", "H"),
+           ("totals", "I"), ("grades", "B")]
+
+
+def is_binary_snapshot(path):
+    try:
+        with open(path, "rb") as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class LazyNames:
+    """The names column of a mapped snapshot. Each name is decoded the first time it
+    is read. Names changed or added after loading are kept in memory.
+
+    close() copies the name bytes out and closes the map, so the snapshot file can be
+    replaced (Windows refuses while it is mapped) and reading names still works.
+    """
+
+    def __init__(self, mm, offsets, base):
+        self.mm = mm
+        self.offsets = offsets
+        self.base = base
+        self.count = len(offsets) - 1
+        self.decoded = {}  # slot -> name, decoded or changed since loading
+        self.extra = []    # names appended after loading
+
+    def __len__(self):
+        return self.count + len(self.extra)
+
+    def __getitem__(self, slot):
+        if slot >= self.count:
+            return self.extra[slot - self.count]
+        name = self.decoded.get(slot)
+        if name is None:
+            start = self.base + self.offsets[slot]
+            end = self.base + self.offsets[slot + 1]
+            name = self.decoded[slot] = sys.intern(self.mm[start:end].decode("utf-8"))
+        return name
+
+    def __setitem__(self, slot, name):
+        if slot >= self.count:
+            self.extra[slot - self.count] = name
+        else:
+            self.decoded[slot] = name
+
+    def __iter__(self):
+        for slot in range(len(self)):
+            yield self[slot]
+
+    def append(self, name):
+        self.extra.append(name)
+
+    def extend(self, names):
+        self.extra.extend(names)
+
+    def close(self):
+        if isinstance(self.mm, mmap.mmap):
+            names = self.mm[self.base:self.base + self.offsets[self.count]]
+            self.mm.close()
+            self.mm, self.base = names, 0
+
+    def copy(self):
+        # The copy usually goes to the compaction thread, which replaces the mapped
+        # file, so neither of them keeps the map
+        self.close()
+        other = LazyNames(self.mm, self.offsets, self.base)
+        other.decoded = dict(self.decoded)
+        other.extra = list(self.extra)
+        return other
+
+
+# ---------- Reading ----------
+
+def load_snapshot(path):
+    """Opens a binary snapshot as a StudentTable. Raises ValueError if it is not one.
+    The names stay mapped from the file until the table's close()."""
+    with open(path, "rb") as file:
+        mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return read_snapshot(path, mm)
+    except Exception:
+        mm.close()
+        raise
+
+
+def read_snapshot(path, mm):
+    if len(mm) < HEADER.size:
+        raise ValueError(f"{path} is not a binary student snapshot")
+    magic, count, names_size = HEADER.unpack_from(mm, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a binary student snapshot")
+
+    pos = HEADER.size
+
+    def take(typecode, length):
+        nonlocal pos
+        column = array(typecode)
+        end = pos + length * column.itemsize
+        column.frombytes(mm[pos:end])
+        if sys.byteorder == "big":
+            column.byteswap()
+        pos = end
+        return column
+
+    table = StudentTable()
+    for name, typecode in COLUMNS:
+        setattr(table, name, take(typecode, count))
+    offsets = take("I", count + 1)
+    if pos + names_size > len(mm):
+        raise ValueError(f"{path} is truncated")
+
+    table.names = LazyNames(mm, offsets, pos)
+    table.alive = bytearray(b"\x01") * count
+    table.live_count = count
+    table.grade_lookup(max(table.totals, default=0))
+    return table
+
+
+# ---------- Writing ----------
+
+def write_binary_snapshot(path, table):
+    """Writes the live students of a StudentTable in the binary format (atomically)."""
+    live = table.live_count != len(table.ids)
+
+    def column(values, typecode):
+        values = array(typecode, compress(values, table.alive) if live else values)
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tobytes()
+
+    encoded = [table.names[slot].encode("utf-8") for slot in table.slots()]
+    offsets = array("I", accumulate((len(name) for name in encoded), initial=0))
+    if sys.byteorder == "big":
+        offsets.byteswap()
+    names = b"".join(encoded)
+
+    def write(file):
+        file.write(HEADER.pack(MAGIC, len(encoded), len(names)))
+        for name, typecode in COLUMNS:
+            file.write(column(getattr(table, name), typecode))
+        file.write(offsets.tobytes())
+        file.write(names)
+
+    atomic_write(path, write, binary=True)
+
+
+# ---------- Converting ----------
+
+def load_text(path):
+    """Parses a comma-separated marks file into a StudentTable."""
+    table = StudentTable()
+    table.extend(parse_rows(split_lines(read_chunks(path))))
+    return table
+
+
+def text_to_binary(src, dst):
+    write_binary_snapshot(dst, load_text(src))
+
+
+def binary_to_text(src, dst):
+    table = load_snapshot(src)
+    write_snapshot(dst, table)
+    table.close()
+
+
+if __name__ == "__main__":
+    commands = {"to-binary": text_to_binary, "to-text": binary_to_text}
+    if len(sys.argv) != 4 or sys.argv[1] not in commands:
+        print("usage: python binary_snapshot.py to-binary|to-text SOURCE DEST")
+        sys.exit(1)
+    commands[sys.argv[1]](sys.argv[2], sys.argv[3])
@@ -0,0 +1,180 @@
+import os
+import threading
+
+from loader import parse_line
+
+ADD, UPDATE, DELETE = "A", "U", "D"
+
+
+def fsync_dir(path):
+    """Makes a rename inside path durable (not supported on Windows, which is fine)."""
+    try:
+        fd = os.open(path or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path, write, binary=False):
+    """Calls write(file) on a temp file, then atomically renames it over path.
+
+    A crash part way through leaves the old file untouched.
+    """
+    tmp_path = path + ".tmp"
+    if binary:
+        file = open(tmp_path, "wb")
+    else:
+        file = open(tmp_path, "w", encoding="utf-8", newline="\n")
+    with file:
+        write(file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+    fsync_dir(os.path.dirname(path))
+
+
+def write_snapshot(path, table):
+    """Writes the live students of a StudentTable as a text marks file."""
+    def write(file):
+        # First line is the count of students, then ID,Name,C1,C2,C3,Exam
+        file.write(f"{len(table)}\n")
+        for slot in table.slots():
+            file.write("%d,%s,%d,%d,%d,%d\n" % table.row(slot))
+    atomic_write(path, write)
+
+
+def parse_record(line):
+    """"A,<row>" / "U,<row>" / "D,<id>" -> (op, row or ID), or None if the line is damaged."""
+    op, _, rest = line.strip().partition(",")
+    if op in (ADD, UPDATE):
+        row = parse_line(rest)
+        return (op, row) if row else None
+    if op == DELETE:
+        try:
+            return (op, int(rest))
+        except ValueError:
+            return None
+    return None
+
+
+class StudentJournal:
+    """Append-only log of edits kept next to the marks file.
+
+    Each add/update/delete is one short line, so saving an edit no longer rewrites
+    the whole file. Lines are fsync'd in batches (sync()). Every so often compact()
+    folds everything into a fresh snapshot on a background thread:
+
+      1. the current journal is renamed to <journal>.old and a new one is started
+      2. the snapshot is written to a temp file and renamed over the marks file
+      3. <journal>.old is deleted
+
+    On startup the snapshot is loaded and then <journal>.old and <journal> are replayed.
+    Replaying is idempotent (adds and updates are upserts, deleting a missing ID does
+    nothing), so a crash between steps 2 and 3 is harmless.
+    """
+
+    def __init__(self, snapshot_path, writer=write_snapshot):
+        self.snapshot_path = snapshot_path
+        self.writer = writer  # writer(path, table) writes a snapshot in the file's format
+        self.path = snapshot_path + ".journal"
+        self.old_path = self.path + ".old"
+        self.file = None
+        self.pending = 0        # lines written since the last fsync
+        self.record_count = 0   # lines not yet folded into the snapshot
+        self.compactor = None
+        self.compaction_error = None
+
+    # ---------- Writing ----------
+
+    def open(self):
+        if self.file is None:
+            self.file = open(self.path, "a", encoding="utf-8", newline="\n")
+
+    def append(self, op, value):
+        """Journals one edit. value is the (ID, Name, C1, C2, C3, Exam) row, or the ID for deletes."""
+        self.open()
+        if op == DELETE:
+            line = f"{op},{value}\n"
+        else:
+            line = f"{op}," + "%d,%s,%d,%d,%d,%d\n" % value
+        self.file.write(line)
+        self.pending += 1
+        self.record_count += 1
+
+    def sync(self):
+        """Flushes and fsyncs everything appended so far (one disk sync for the whole batch)."""
+        if self.file and self.pending:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.pending = 0
+
+    def close(self):
+        self.sync()
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    # ---------- Reading ----------
+
+    def replay(self):
+        """Yields (op, row or ID) for every edit not yet folded into the snapshot, oldest first."""
+        self.record_count = 0
+        for path in (self.old_path, self.path):
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    for line in file:
+                        record = parse_record(line)
+                        if record:
+                            self.record_count += 1
+                            yield record
+            except FileNotFoundError:
+                continue
+
+    # ---------- Compaction ----------
+
+    def needs_compaction(self):
+        return self.record_count > 0 or os.path.exists(self.old_path)
+
+    def is_compacting(self):
+        return self.compactor is not None and self.compactor.is_alive()
+
+    def compact(self, table):
+        """Folds the journal into a new snapshot of table on a background thread.
+
+        table must be a private copy: the UI keeps editing the live one meanwhile.
+        Returns False if a compaction is already running.
+        """
+        if self.is_compacting():
+            return False
+
+        self.close()
+        if os.path.exists(self.path):
+            if os.path.exists(self.old_path):
+                # Left over from an interrupted compaction, its edits are in table too
+                with open(self.old_path, "a", encoding="utf-8", newline="\n") as old, \
+                        open(self.path, "r", encoding="utf-8") as current:
+                    old.write(current.read())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.old_path)
+        self.record_count = 0
+        self.open()  # new edits go to a fresh journal while the snapshot is written
+
+        self.compaction_error = None
+        self.compactor = threading.Thread(target=self.write_compacted, args=(table,), daemon=True)
+        self.compactor.start()
+        return True
+
+    def write_compacted(self, table):
+        try:
+            self.writer(self.snapshot_path, table)
+            if os.path.exists(self.old_path):
+                os.remove(self.old_path)
+        except Exception as e:
+            # The old snapshot and journal are still intact, it will be retried
+            self.compaction_error = e
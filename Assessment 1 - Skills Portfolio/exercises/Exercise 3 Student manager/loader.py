@@ -0,0 +1,157 @@
+import os
+import queue
+import threading
+
+from student_table import validate_row
+
+CHUNK_SIZE = 1 << 16   # bytes read from disk at a time
+BATCH_SIZE = 5000      # parsed rows handed to the UI at a time
+MAX_BATCHES_PER_POLL = 4  # keeps each UI tick short while a big file streams in
+
+
+# ---------- Generator Pipeline ----------
+# file -> byte chunks -> lines -> parsed rows -> batches of rows
+
+def read_chunks(path, chunk_size=CHUNK_SIZE):
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def split_lines(chunks):
+    """Re-joins lines that were cut in half at a chunk boundary."""
+    tail = b""
+    for chunk in chunks:
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()
+        yield from lines
+    if tail:
+        yield tail
+
+
+def parse_line(line):
+    """"ID,Name,C1,C2,C3,Exam" -> tuple, or None for a line that is not a valid student."""
+    parts = line.strip().split(",")
+    if len(parts) != 6: return None
+    try:
+        s_id = int(parts[0])
+        name = parts[1].strip()
+        c1, c2, c3, exam = map(int, parts[2:])
+        validate_row(s_id, name, c1, c2, c3, exam)
+    except ValueError:
+        return None
+    return (s_id, name, c1, c2, c3, exam)
+
+
+def parse_rows(lines):
+    lines = iter(lines)
+    next(lines, None)  # first line is the student count
+    for line in lines:
+        row = parse_line(line.decode("utf-8", errors="replace"))
+        if row:
+            yield row
+
+
+def batched(rows, size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ---------- Background Loader ----------
+
+class StudentLoader:
+    """Parses the marks file on a worker thread and feeds batches to the Tk thread.
+
+    Tk is not thread safe, so the worker only puts batches on a queue and the
+    UI side picks them up with root.after. Callbacks run on the Tk thread:
+      on_batch(rows, progress)  progress is 0.0 - 1.0 of the file read so far
+      on_done(cancelled)
+      on_error(exception)
+    """
+
+    def __init__(self, root, path, on_batch, on_done, on_error, poll_ms=30):
+        self.root = root
+        self.path = path
+        self.on_batch = on_batch
+        self.on_done = on_done
+        self.on_error = on_error
+        self.poll_ms = poll_ms
+
+        self.batches = queue.Queue(maxsize=20)  # the worker waits if the UI falls behind
+        self.cancelled = threading.Event()
+        self.finished = False
+        self.bytes_read = 0
+        self.worker = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.worker.start()
+        self.root.after(self.poll_ms, self.poll)
+        return self
+
+    def cancel(self):
+        """Stops the worker. Batches still in the queue are dropped."""
+        if not self.finished:
+            self.cancelled.set()
+
+    # ---------- Worker Thread ----------
+
+    def counted(self, chunks):
+        for chunk in chunks:
+            self.bytes_read += len(chunk)
+            yield chunk
+
+    def run(self):
+        try:
+            size = max(1, os.path.getsize(self.path))
+            chunks = self.counted(read_chunks(self.path))
+            for batch in batched(parse_rows(split_lines(chunks))):
+                if self.cancelled.is_set():
+                    return
+                self.put(("batch", batch, min(1.0, self.bytes_read / size)))
+            self.put(("done", None, 1.0))
+        except Exception as e:
+            self.put(("error", e, 0.0))
+
+    def put(self, message):
+        # Give up waiting on a full queue once the load has been cancelled
+        while not self.cancelled.is_set():
+            try:
+                self.batches.put(message, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    # ---------- Tk Thread ----------
+
+    def poll(self):
+        if self.cancelled.is_set():
+            self.finished = True
+            self.on_done(cancelled=True)
+            return
+
+        for _ in range(MAX_BATCHES_PER_POLL):
+            try:
+                kind, payload, progress = self.batches.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "batch":
+                self.on_batch(payload, progress)
+            else:
+                self.finished = True
+                if kind == "done":
+                    self.on_done(cancelled=False)
+                else:
+                    self.on_error(payload)
+                return
+
+        self.root.after(self.poll_ms, self.poll)
@@ -0,0 +1,139 @@
+from array import array
+
+
+class SearchIndex:
+    """Case-insensitive "contains" search over student names and IDs.
+
+    Every student gets a precomputed search key ("name\\nid", lower case) and each
+    n-gram of that key points back to the student. A query only has to check the
+    students listed under its rarest n-gram instead of the whole roster.
+    Each entry also carries a "row" (whatever the view shows, e.g. a table slot),
+    which is what search() hands back.
+    """
+
+    def __init__(self, gram_size=3):
+        self.gram_size = gram_size
+        self.entries = {}   # ID -> (search key, row), kept in roster order
+        self.rank = {}      # ID -> position in the roster, used to order results
+        self.next_rank = 0
+        # n-gram -> IDs. Updates and deletes leave stale IDs behind, results are
+        # always re-checked against self.entries so they never leak through.
+        self.postings = {}
+        self.stale = 0
+
+        # Last query + its results, so typing more letters only narrows them down
+        self.last_query = None
+        self.last_results = None
+
+    # ---------- Building ----------
+
+    @staticmethod
+    def make_key(s_id, name):
+        return f"{name.lower()}\n{s_id}"
+
+    def grams(self, text):
+        n = self.gram_size
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def build(self, students):
+        self.entries = {}
+        self.rank = {}
+        self.next_rank = 0
+        self.postings = {}
+        self.stale = 0
+        self.add_many(students)
+
+    def add_many(self, students):
+        """Indexes (ID, name, row) triples in one pass (same result as add() per student)."""
+        n = self.gram_size
+        entries, rank, lists = self.entries, self.rank, {}
+        next_rank = self.next_rank
+        for s_id, name, row in students:
+            key = self.make_key(s_id, name)
+            if s_id not in rank:
+                rank[s_id] = next_rank
+                next_rank += 1
+            entries[s_id] = (key, row)
+            for gram in {key[i:i + n] for i in range(len(key) - n + 1)}:
+                posting = lists.get(gram)
+                if posting is None:
+                    lists[gram] = [s_id]
+                else:
+                    posting.append(s_id)
+        self.next_rank = next_rank
+
+        # Compact typed arrays take far less memory than lists of ints
+        for gram, ids in lists.items():
+            posting = self.postings.get(gram)
+            if posting is None:
+                self.postings[gram] = array("l", ids)
+            else:
+                posting.extend(ids)
+        self.forget_last_query()
+
+    def add(self, s_id, name, row):
+        key = self.make_key(s_id, name)
+        if s_id not in self.rank:
+            self.rank[s_id] = self.next_rank
+            self.next_rank += 1
+        self.entries[s_id] = (key, row)
+
+        for gram in self.grams(key):
+            posting = self.postings.get(gram)
+            if posting is None:
+                posting = self.postings[gram] = array("l")
+            posting.append(s_id)
+        self.forget_last_query()
+
+    def update(self, s_id, name, row):
+        old = self.entries.get(s_id)
+        if old and old[0] == self.make_key(s_id, name):
+            # Name unchanged, the postings are still right
+            self.entries[s_id] = (old[0], row)
+            self.forget_last_query()
+            return
+        self.stale += 1
+        self.add(s_id, name, row)
+        self.compact_if_needed()
+
+    def remove(self, s_id):
+        if self.entries.pop(s_id, None) is not None:
+            self.rank.pop(s_id, None)
+            self.stale += 1
+            self.forget_last_query()
+            self.compact_if_needed()
+
+    def compact_if_needed(self):
+        """Rebuilds the postings once stale IDs outnumber live students."""
+        if self.stale > max(1000, len(self.entries)):
+            self.build([(s_id, key.rsplit("\n", 1)[0], row)
+                        for s_id, (key, row) in self.entries.items()])
+
+    def forget_last_query(self):
+        self.last_query = None
+        self.last_results = None
+
+    # ---------- Searching ----------
+
+    def search(self, query):
+        """Returns the matching rows in roster order, or None for an empty query."""
+        query = query.lower().strip()
+        if not query:
+            return None
+
+        if self.last_query is not None and self.last_query in query:
+            # The query was extended: every match is already in the last results
+            ids = [s_id for s_id in self.last_results if query in self.entries[s_id][0]]
+        elif len(query) >= self.gram_size:
+            empty = array("l")
+            rarest = min((self.postings.get(g, empty) for g in self.grams(query)), key=len)
+            ids = [s_id for s_id in dict.fromkeys(rarest)
+                   if s_id in self.entries and query in self.entries[s_id][0]]
+            ids.sort(key=self.rank.__getitem__)
+        else:
+            # Too short for an n-gram, scan the precomputed keys instead
+            ids = [s_id for s_id, (key, _) in self.entries.items() if query in key]
+
+        self.last_query = query
+        self.last_results = ids
+        return [self.entries[s_id][1] for s_id in ids]
@@ -0,0 +1,120 @@
+from collections import Counter, defaultdict
+from itertools import compress, repeat
+from operator import and_, eq
+
+# StudentTable columns that get running statistics
+STAT_COLUMNS = ("c1", "c2", "c3", "exam", "totals")
+
+
+class MarkHistogram:
+    """How many students have each mark in one column.
+
+    Marks only take a few hundred distinct values, so count, sum, min, max and median
+    all come from the histogram without looking at the students again.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.count = 0
+        self.total = 0
+
+    def add_many(self, values):
+        values = list(values)
+        self.counts.update(values)
+        self.count += len(values)
+        self.total += sum(values)
+
+    def add(self, value):
+        self.counts[value] += 1
+        self.count += 1
+        self.total += value
+
+    def remove(self, value):
+        self.counts[value] -= 1
+        if not self.counts[value]:
+            del self.counts[value]
+        self.count -= 1
+        self.total -= value
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def minimum(self):
+        return min(self.counts) if self.counts else 0
+
+    def maximum(self):
+        return max(self.counts) if self.counts else 0
+
+    def median(self):
+        if not self.count:
+            return 0
+        # Walk the distinct marks in order until the middle student(s) are reached
+        low, high = (self.count - 1) // 2, self.count // 2
+        seen = 0
+        low_value = None
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if low_value is None and seen > low:
+                low_value = value
+            if seen > high:
+                return (low_value + value) / 2
+
+
+class StudentStats:
+    """Running aggregates over the live students of a StudentTable.
+
+    Keeps the slots in each grade plus a histogram per mark column. The table calls
+    add/remove as students change, so grade filters and summary figures never rescan.
+    """
+
+    def __init__(self, table):
+        self.by_grade = defaultdict(set)      # grade code -> slots
+        self.grade_totals = Counter()         # grade code -> sum of total marks
+        self.columns = {name: MarkHistogram() for name in STAT_COLUMNS}
+        self.add_range(table, 0, len(table.ids))
+
+    def __len__(self):
+        return self.columns["totals"].count
+
+    def add_range(self, table, first, last):
+        """Adds slots first..last-1 (skipping deleted ones), a column at a time."""
+        alive = table.alive[first:last]
+        some_deleted = alive.count(0) > 0
+        for name, histogram in self.columns.items():
+            values = getattr(table, name)[first:last]
+            histogram.add_many(compress(values, alive) if some_deleted else values)
+        grades = table.grades[first:last]
+        totals = table.totals[first:last]
+        for code in set(grades):
+            # One C-level pass per grade instead of a Python loop over every student
+            mask = bytes(map(eq, grades, repeat(code)))
+            if some_deleted:
+                mask = bytes(map(and_, mask, alive))
+            self.by_grade[code].update(compress(range(first, last), mask))
+            self.grade_totals[code] += sum(compress(totals, mask))
+
+    def add(self, table, slot):
+        for name, histogram in self.columns.items():
+            histogram.add(getattr(table, name)[slot])
+        code = table.grades[slot]
+        self.by_grade[code].add(slot)
+        self.grade_totals[code] += table.totals[slot]
+
+    def remove(self, table, slot):
+        for name, histogram in self.columns.items():
+            histogram.remove(getattr(table, name)[slot])
+        code = table.grades[slot]
+        self.by_grade[code].discard(slot)
+        self.grade_totals[code] -= table.totals[slot]
+
+    # ---------- Reading ----------
+
+    def grade_count(self, code):
+        return len(self.by_grade[code])
+
+    def grade_slots(self, code):
+        """Slots with this grade in roster order."""
+        return sorted(self.by_grade[code])
+
+    def column(self, name):
+        return self.columns[name]
@@ -0,0 +1,234 @@
+import sys
+from array import array
+from itertools import compress, repeat
+
+from student_stats import StudentStats
+
+MAX_MARKS = 160  # 3 x 20 coursework + 100 exam
+GRADE_LETTERS = "ABCDF"
+
+# Largest values the typed columns can hold
+MAX_ID = 2**31 - 1
+MAX_MARK = 0xFFFF
+
+
+def calculate_grade(percentage):
+    if percentage >= 70: return "A"
+    if percentage >= 60: return "B"
+    if percentage >= 50: return "C"
+    if percentage >= 40: return "D"
+    return "F"
+
+
+def validate_row(s_id, name, c1, c2, c3, exam):
+    """Raises ValueError for a record that is invalid or will not fit in the columns."""
+    if not name: raise ValueError("Name cannot be empty")
+    if "," in name: raise ValueError("Name cannot contain commas")
+    if any(x < 0 for x in [c1, c2, c3, exam]): raise ValueError("Marks cannot be negative")
+    if any(x > MAX_MARK for x in [c1, c2, c3, exam]): raise ValueError("Marks are too large")
+    if not 0 <= s_id <= MAX_ID: raise ValueError("ID is out of range")
+
+
+class StudentRecord:
+    """One student read straight out of the table, used like the old dicts: s["Name"], s["Grade"]."""
+    __slots__ = ("table", "slot")
+
+    def __init__(self, table, slot):
+        self.table = table
+        self.slot = slot
+
+    def __getitem__(self, field):
+        return self.table.value(self.slot, field)
+
+
+class StudentTable:
+    """Student records stored column by column in typed arrays instead of one dict each.
+
+    Only ID, name and the four raw marks are real data. Total and grade code are derived
+    (4 + 1 bytes per student) and the percentage is worked out when asked for.
+    Rows are addressed by slot number and looked up by ID through a dict index.
+    Deleting leaves a tombstone so slots held by the table view and search index stay
+    valid; compacted() drops the tombstones once they pile up.
+    """
+
+    def __init__(self):
+        self.ids = array("i")
+        self.names = []          # interned, so repeated names share one string
+        self.c1 = array("H")
+        self.c2 = array("H")
+        self.c3 = array("H")
+        self.exam = array("H")
+        self.totals = array("I")
+        self.grades = array("B")  # index into GRADE_LETTERS
+        self.alive = bytearray()
+        self.live_count = 0
+        self.grade_by_total = bytearray()  # lookup table: total marks -> grade code
+        self.slot_by_id = None  # ID -> live slot, built on the first lookup
+        self.stats = None       # running aggregates, built the first time they are asked for
+        self.marks_total = None  # running sum of Total over live students, once asked for
+
+    def __len__(self):
+        return self.live_count
+
+    def __iter__(self):
+        for slot in self.slots():
+            yield StudentRecord(self, slot)
+
+    # ---------- Derived Values ----------
+
+    def grade_lookup(self, max_total):
+        """Grows the total -> grade code table so it covers max_total."""
+        for total in range(len(self.grade_by_total), max_total + 1):
+            grade = calculate_grade((total / MAX_MARKS) * 100)
+            self.grade_by_total.append(GRADE_LETTERS.index(grade))
+        return self.grade_by_total
+
+    def percentage(self, slot):
+        return round((self.totals[slot] / MAX_MARKS) * 100, 2)
+
+    def grade(self, slot):
+        return GRADE_LETTERS[self.grades[slot]]
+
+    # ---------- Adding and Changing ----------
+
+    def extend(self, rows):
+        """Bulk append of (ID, Name, C1, C2, C3, Exam) tuples. Derived columns are
+        computed for the whole batch at once rather than record by record."""
+        rows = list(rows)
+        if not rows:
+            return
+        ids, names, c1, c2, c3, exam = zip(*rows)
+        if self.slot_by_id is not None:
+            self.slot_by_id.update(zip(ids, range(len(self.ids), len(self.ids) + len(ids))))
+        self.ids.extend(ids)
+        self.names.extend(map(sys.intern, names))
+        self.c1.extend(c1)
+        self.c2.extend(c2)
+        self.c3.extend(c3)
+        self.exam.extend(exam)
+
+        totals = array("I", map(sum, zip(c1, c2, c3, exam)))
+        lookup = self.grade_lookup(max(totals))
+        self.totals.extend(totals)
+        self.grades.extend(map(lookup.__getitem__, totals))
+        self.alive.extend(repeat(1, len(rows)))
+        self.live_count += len(rows)
+        if self.marks_total is not None:
+            self.marks_total += sum(totals)
+        if self.stats is not None:
+            self.stats.add_range(self, len(self.ids) - len(rows), len(self.ids))
+
+    def append(self, s_id, name, c1, c2, c3, exam):
+        """Adds one student and returns its slot."""
+        self.extend([(s_id, name, c1, c2, c3, exam)])
+        return len(self.ids) - 1
+
+    def update(self, slot, name, c1, c2, c3, exam):
+        if self.stats is not None:
+            self.stats.remove(self, slot)
+        self.names[slot] = sys.intern(name)
+        self.c1[slot], self.c2[slot], self.c3[slot], self.exam[slot] = c1, c2, c3, exam
+        total = c1 + c2 + c3 + exam
+        if self.marks_total is not None and self.alive[slot]:
+            self.marks_total += total - self.totals[slot]
+        self.totals[slot] = total
+        self.grades[slot] = self.grade_lookup(total)[total]
+        if self.stats is not None:
+            self.stats.add(self, slot)
+
+    def delete(self, slot):
+        if self.alive[slot]:
+            self.alive[slot] = 0
+            self.live_count -= 1
+            if self.marks_total is not None:
+                self.marks_total -= self.totals[slot]
+            if self.stats is not None:
+                self.stats.remove(self, slot)
+            if self.slot_by_id is not None and self.slot_by_id.get(self.ids[slot]) == slot:
+                del self.slot_by_id[self.ids[slot]]
+
+    def dead_count(self):
+        return len(self.ids) - self.live_count
+
+    def compacted(self):
+        """A new table holding only the live students (slot numbers change)."""
+        other = StudentTable()
+        other.extend(self.row(slot) for slot in self.slots())
+        return other
+
+    def close(self):
+        """Lets go of the snapshot file the names may be mapped from (see
+        binary_snapshot.LazyNames). The table stays usable."""
+        close = getattr(self.names, "close", None)
+        if close is not None:
+            close()
+
+    def copy(self):
+        """Independent copy (the arrays are copied in bulk, nothing per row)."""
+        other = StudentTable()
+        for column in ("ids", "c1", "c2", "c3", "exam", "totals", "grades"):
+            setattr(other, column, array(getattr(self, column).typecode, getattr(self, column)))
+        other.names = self.names.copy()
+        other.alive = bytearray(self.alive)
+        other.live_count = self.live_count
+        other.marks_total = self.marks_total
+        other.grade_by_total = bytearray(self.grade_by_total)
+        return other
+
+    # ---------- Reading ----------
+
+    def slots(self):
+        """Live slots in roster order (a range while nothing has been deleted)."""
+        if self.live_count == len(self.ids):
+            return range(len(self.ids))
+        return list(compress(range(len(self.ids)), self.alive))
+
+    def aggregates(self):
+        """Per-grade slots and per-column statistics, kept up to date from here on."""
+        if self.stats is None:
+            self.stats = StudentStats(self)
+        return self.stats
+
+    def total_marks(self):
+        """Sum of Total over the live students. Summed once, then kept up to date."""
+        if self.marks_total is None:
+            self.marks_total = sum(compress(self.totals, self.alive))
+        return self.marks_total
+
+    def slots_with_grade(self, letter):
+        return self.aggregates().grade_slots(GRADE_LETTERS.index(letter))
+
+    def find(self, s_id):
+        """Slot of the live student with this ID, or None."""
+        if self.slot_by_id is None:
+            live = self.slots()
+            self.slot_by_id = dict(zip(map(self.ids.__getitem__, live), live))
+        return self.slot_by_id.get(s_id)
+
+    def record(self, slot):
+        return StudentRecord(self, slot)
+
+    def row(self, slot):
+        """The raw (ID, Name, C1, C2, C3, Exam) tuple, as stored in the text file."""
+        return (self.ids[slot], self.names[slot], self.c1[slot], self.c2[slot],
+                self.c3[slot], self.exam[slot])
+
+    def value(self, slot, field):
+        if field == "Percentage":
+            return self.percentage(slot)
+        if field == "Grade":
+            return self.grade(slot)
+        return self.column(field)[slot]
+
+    def column(self, field):
+        return {
+            "ID": self.ids, "Name": self.names, "C1": self.c1, "C2": self.c2,
+            "C3": self.c3, "Exam": self.exam, "Total": self.totals, "Grade": self.grades,
+            "Percentage": self.totals,  # same order as the percentage
+        }[field]
+
+    def sort_key(self, field):
+        """slot -> sort key for a field, read straight from its column."""
+        if field == "Name":
+            return lambda slot: self.names[slot].lower()
+        return self.column(field).__getitem__
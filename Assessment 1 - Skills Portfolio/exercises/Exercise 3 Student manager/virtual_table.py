@@ -0,0 +1,395 @@
+import tkinter as tk
+
+REMOVED = object()  # stands in for a deleted row until the list is compacted
+BLOCK = 512         # rows per block of live counts in RowList
+
+
+def sort_in_place(rows, sort_keys):
+    """Multi-column stable sort. sort_keys is [(key_func, reverse), ...], most important first.
+
+    Python's sort is stable, so sorting by the last key first and the first key last
+    gives the combined order without building composite keys.
+    """
+    for key, reverse in reversed(sort_keys):
+        rows.sort(key=key, reverse=reverse)
+
+
+class RowList:
+    """The rows of a VirtualTable in display order, with O(log n) removal.
+
+    A removed row leaves REMOVED behind, so nothing after it moves and indexes into
+    the list (e.g. a key -> index map) stay valid. The number of live rows in each
+    block of BLOCK entries is kept in a Fenwick tree, which turns a display position
+    into a list index and back. "index" below is a place in self.items, "position"
+    a place among the live rows. Once the holes outnumber the live rows they are
+    dropped in one pass, so that cost is spread over all the removals before it.
+
+    A range (e.g. every slot of a roster) is kept as it is and only turned into a
+    list by the first change, so handing one over is O(1).
+    """
+
+    def __init__(self, rows=()):
+        self.items = rows if isinstance(rows, range) else list(rows)
+        self.live = len(self.items)
+        self.block_live = None  # live rows per block, only kept once there are holes
+        self.tree = None        # Fenwick tree over block_live (1-based)
+
+    def __len__(self):
+        return self.live
+
+    def __getitem__(self, position):
+        """Row at a display position (0 <= position < len)."""
+        return self.items[self.index_at(position)]
+
+    def live_rows(self):
+        """The live rows in display order (a range until the first change)."""
+        if self.tree is None:
+            return self.items
+        return [row for row in self.items if row is not REMOVED]
+
+    # ---------- Positions ----------
+
+    def index_at(self, position):
+        if self.tree is None:
+            return position
+        # Walk down the Fenwick tree to the block holding this position
+        tree = self.tree
+        block = before = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            node = block + step
+            if node < len(tree) and before + tree[node] <= position:
+                block = node
+                before += tree[node]
+            step >>= 1
+
+        start = block * BLOCK
+        left = position - before
+        if self.block_live[block] == min(BLOCK, len(self.items) - start):
+            return start + left  # no holes in this block
+        for index in range(start, start + BLOCK):
+            if self.items[index] is not REMOVED:
+                if not left:
+                    return index
+                left -= 1
+        raise IndexError(position)
+
+    def position_of(self, index):
+        """Display position of the (live) row at list index."""
+        if self.tree is None:
+            return index
+        block = index // BLOCK
+        start = block * BLOCK
+        before, node = 0, block
+        while node:
+            before += self.tree[node]
+            node -= node & -node
+        return before + (index - start) - self.items[start:index].count(REMOVED)
+
+    def index(self, row):
+        """Display position of row. Raises ValueError if it is not shown."""
+        return self.position_of(self.items.index(row))
+
+    # ---------- Changes ----------
+
+    def own(self):
+        if isinstance(self.items, range):
+            self.items = list(self.items)
+
+    def replace(self, index, row):
+        self.own()
+        self.items[index] = row
+
+    def add_to_block(self, block, delta):
+        self.block_live[block] += delta
+        node = block + 1
+        while node < len(self.tree):
+            self.tree[node] += delta
+            node += node & -node
+
+    def extend(self, rows):
+        self.own()
+        start = len(self.items)
+        self.items.extend(rows)
+        added = len(self.items) - start
+        self.live += added
+        if self.tree is None:
+            return
+        for index in range(start, len(self.items)):
+            block = index // BLOCK
+            if block < len(self.block_live):
+                self.add_to_block(block, 1)
+                continue
+            # A new block: its node covers the blocks (node - lowbit, node]
+            self.block_live.append(1)
+            node = len(self.tree)
+            low = node - (node & -node)
+            total = 1
+            for covered in range(low, node - 1):
+                total += self.block_live[covered]
+            self.tree.append(total)
+
+    def remove(self, index):
+        """Removes the row at list index. Returns True when the list was compacted,
+        which changes every index after the first hole."""
+        self.own()
+        if self.tree is None:
+            self.block_live = [min(BLOCK, len(self.items) - start)
+                               for start in range(0, len(self.items), BLOCK)]
+            tree = [0] + self.block_live
+            for node in range(1, len(tree)):
+                parent = node + (node & -node)
+                if parent < len(tree):
+                    tree[parent] += tree[node]
+            self.tree = tree
+        self.items[index] = REMOVED
+        self.live -= 1
+        self.add_to_block(index // BLOCK, -1)
+
+        if len(self.items) - self.live > max(BLOCK, self.live):
+            self.items = self.live_rows()
+            self.block_live = self.tree = None
+            return True
+        return False
+
+
+
+class VirtualTable:
+    """Shows a long list of rows in a Treeview while only keeping a screenful of items alive.
+
+    The Treeview gets a small pool of items (visible rows + a buffer). Scrolling does not
+    create or delete anything, it just repaints the pooled items with the rows now in view.
+    """
+
+    def __init__(self, tree, scrollbar, format_row, row_key, buffer=5):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.format_row = format_row  # row -> (values, tags)
+        self.row_key = row_key        # row -> unique key (the student ID)
+        self.buffer = buffer
+
+        self.rows = RowList()
+        self.offset = 0      # index of the first row painted into the pool
+        self.items = []      # pooled Treeview item ids, top to bottom
+        self.item_by_key = {}  # key -> Treeview item, only for rows currently painted
+        self.positions = None  # key -> index in self.rows.items, rebuilt lazily after reorders
+        self.selected = None  # the selected row itself, so it survives scrolling and sorting
+
+        # We drive the scrollbar ourselves, the Treeview only ever sees the pool
+        self.scrollbar.configure(command=self.on_scrollbar)
+        self.tree.configure(yscrollcommand="")
+
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_by(-3))  # Linux wheel up
+        self.tree.bind("<Button-5>", lambda e: self.scroll_by(3))   # Linux wheel down
+        self.tree.bind("<Up>", lambda e: self.move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self.move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self.scroll_by(-self.visible_rows()))
+        self.tree.bind("<Next>", lambda e: self.scroll_by(self.visible_rows()))
+
+    # ---------- Geometry ----------
+
+    def visible_rows(self):
+        """How many rows fit in the Treeview right now (at least 1)."""
+        row_height = 25  # matches the Treeview rowheight set in setup_styles
+        height = self.tree.winfo_height()
+        if height <= 1:
+            # Not mapped yet, fall back to the requested height
+            height = self.tree.winfo_reqheight()
+        return max(1, (height - row_height) // row_height)  # minus the heading row
+
+    def pool_size(self):
+        # Near the end there are fewer rows left than the buffer wants
+        return min(len(self.rows) - self.offset, self.visible_rows() + self.buffer)
+
+    def max_offset(self):
+        return max(0, len(self.rows) - self.visible_rows())
+
+    # ---------- Public API ----------
+
+    def set_rows(self, rows, sort_keys=None):
+        """Replaces the rows being shown. Painting depends on the window size, not
+        len(rows). Unsorted, a range is shown as it is (O(1)) and a list is copied
+        (O(n), C speed); with sort_keys the rows are sorted, O(n log n)."""
+        if sort_keys:
+            rows = list(rows)
+            sort_in_place(rows, sort_keys)
+        self.rows = RowList(rows)
+        self.positions = None
+        self.offset = min(self.offset, self.max_offset())
+        self.repaint()
+
+    def sort_rows(self, sort_keys):
+        """Re-sorts the current rows and repaints once."""
+        rows = list(self.rows.live_rows())
+        sort_in_place(rows, sort_keys)
+        self.rows = RowList(rows)
+        self.positions = None
+        self.repaint()
+
+    # ---------- Row Level Updates ----------
+    # Single record edits touch at most one Treeview item (or repaint the small pool)
+    # instead of rebuilding the whole table. The key map is only rebuilt after a new
+    # set of rows, a sort or a compaction, never for an edit.
+
+    def index_of(self, key):
+        if self.positions is None:
+            self.positions = {self.row_key(row): i for i, row in enumerate(self.rows.items)
+                              if row is not REMOVED}
+        return self.positions.get(key)
+
+    def insert_row(self, row):
+        """Adds a row to the end of the view."""
+        self.insert_rows([row])
+
+    def insert_rows(self, rows):
+        """Adds rows to the end of the view with at most one repaint."""
+        rows = list(rows)
+        start = len(self.rows)
+        if self.positions is not None:
+            for i, row in enumerate(rows, len(self.rows.items)):
+                self.positions[self.row_key(row)] = i
+        self.rows.extend(rows)
+
+        if start < self.offset + self.visible_rows() + self.buffer:
+            self.repaint()  # some new rows land inside the painted window
+        else:
+            self.update_scrollbar()
+
+    def update_row(self, row):
+        """Replaces the row with the same key and patches its item if it is on screen."""
+        key = self.row_key(row)
+        index = self.index_of(key)
+        if index is None:
+            return False
+
+        if self.rows.items[index] == self.selected:
+            self.selected = row
+        self.rows.replace(index, row)
+
+        item = self.item_by_key.get(key)
+        if item:
+            values, tags = self.format_row(row)
+            self.tree.item(item, values=values, tags=tags)
+        return True
+
+    def delete_row(self, key):
+        """Removes the row with this key. Returns the removed row (or None)."""
+        index = self.index_of(key)
+        if index is None:
+            return None
+
+        pos = self.rows.position_of(index)
+        row = self.rows.items[index]
+        del self.positions[key]
+        if self.rows.remove(index):
+            self.positions = None  # compacted, the indexes after the first hole moved
+        if row == self.selected:
+            self.selected = None
+
+        if pos < self.offset:
+            # Above the window: keep the same rows on screen
+            self.offset -= 1
+            self.update_scrollbar()
+        elif key in self.item_by_key:
+            self.offset = min(self.offset, self.max_offset())
+            self.repaint()
+        else:
+            self.update_scrollbar()
+        return row
+
+    def selected_row(self):
+        return self.selected
+
+    def scroll_by(self, delta):
+        self.scroll_to(self.offset + delta)
+        return "break"
+
+    def scroll_to(self, offset):
+        offset = max(0, min(int(offset), self.max_offset()))
+        if offset != self.offset:
+            self.offset = offset
+            self.repaint()
+
+    # ---------- Painting ----------
+
+    def resize_pool(self):
+        """Grows or shrinks the item pool to fit the window."""
+        wanted = self.pool_size()
+        while len(self.items) < wanted:
+            self.items.append(self.tree.insert("", tk.END, values=()))
+        while len(self.items) > wanted:
+            self.tree.delete(self.items.pop())
+
+    def repaint(self):
+        self.resize_pool()
+
+        selected_item = None
+        self.item_by_key = {}
+        for i, item in enumerate(self.items):
+            row = self.rows[self.offset + i]
+            values, tags = self.format_row(row)
+            self.tree.item(item, values=values, tags=tags)
+            self.item_by_key[self.row_key(row)] = item
+            if row == self.selected:
+                selected_item = item
+
+        if selected_item:
+            self.tree.selection_set(selected_item)
+        elif self.tree.selection():
+            self.tree.selection_remove(self.tree.selection())
+
+        # The pool never scrolls internally, the offset does that job
+        self.tree.yview_moveto(0)
+        self.update_scrollbar()
+
+    def update_scrollbar(self):
+        total = len(self.rows)
+        if total == 0:
+            self.scrollbar.set(0, 1)
+            return
+        first = self.offset / total
+        last = min(1.0, (self.offset + self.visible_rows()) / total)
+        self.scrollbar.set(first, last)
+
+    # ---------- Event Handlers ----------
+
+    def on_resize(self, event=None):
+        self.offset = min(self.offset, self.max_offset())
+        self.repaint()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(amount) * len(self.rows))
+        elif action == "scroll":
+            step = self.visible_rows() if unit == "pages" else 1
+            self.scroll_by(int(amount) * step)
+
+    def on_mousewheel(self, event):
+        # Windows/macOS report multiples of 120 per notch
+        return self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def on_select(self, event=None):
+        selection = self.tree.selection()
+        if selection and selection[0] in self.items:
+            self.selected = self.rows[self.offset + self.items.index(selection[0])]
+
+    def move_selection(self, delta):
+        """Arrow keys: move the selection and scroll when it leaves the window."""
+        if not self.rows:
+            return "break"
+        try:
+            index = self.rows.index(self.selected) + delta
+        except ValueError:
+            index = self.offset
+        index = max(0, min(index, len(self.rows) - 1))
+        self.selected = self.rows[index]
+
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + self.visible_rows():
+            self.offset = index - self.visible_rows() + 1
+        self.repaint()
+        return "break"